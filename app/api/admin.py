@@ -0,0 +1,28 @@
+import hmac
+import os
+
+from fastapi import APIRouter, Header, HTTPException
+
+from app.services.data_service import data_service
+
+router = APIRouter()
+
+# Endpoint admin wajib header X-Admin-Token; tanpa ADMIN_TOKEN endpoint admin selalu ditolak
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def _check_token(token):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    # compare_digest: waktu perbandingan tidak bocorkan panjang prefix yang cocok
+    if token is None or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.post("/admin/reload")
+async def reload_data(force: bool = False, x_admin_token: str = Header(None)):
+    """Re-read mock_db.json without restarting; in-flight requests keep the old snapshot."""
+    _check_token(x_admin_token)
+    reloaded = await data_service.reload(force=force)
+    snap = data_service.snapshot
+    return {"reloaded": reloaded, "version": snap.version, "groups": len(snap.groups)}
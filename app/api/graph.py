@@ -1,74 +1,203 @@
-from fastapi import APIRouter
+import base64
+import hashlib
+import math
+from typing import List, Optional
 
+import orjson
+
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+
+from app.api.caching import etag_matches, not_modified
+from app.api.middleware import encoded_response
+from app.services.communities import get_communities
+from app.services.contagion import CONTAGION_METHODS, get_contagion
 from app.services.data_service import data_service
+from app.services.graph_binary import GRAPH_BINARY_MEDIA_TYPE, get_binary_topology
+from app.services.graph_service import filter_rows, get_tile_body, get_topology, page_topology, to_json_bytes
+from app.services.hierarchy import LOD_LEVELS, get_lod_payload
 
 router = APIRouter()
 
+# Dashboard boleh cache, tapi wajib revalidate (ETag) tiap poll
+GRAPH_CACHE_CONTROL = "no-cache"
+MAX_PAGE_SIZE = 10000
+MAX_TILE_ZOOM = 24
+QUOTE = '"'
+
 
 @router.get("/graph")
-async def get_graph_topology():
-    groups = data_service.get_all_groups()
-    nodes = []
-    edges = []
-
-    # Build Nodes (Grup)
-    for gid, g in groups.items():
-        color = "#10B981"  # Green (Healthy)
-        if g["type"] == "toxic":
-            color = "#EF4444"  # Red (Danger)
-        elif g["type"] == "medium":
-            color = "#F59E0B"  # Orange/Yellow (Medium Risk)
-
-        nodes.append(
-            {
-                "key": gid,
-                "attributes": {
-                    "label": g["header"]["name"],
-                    "x": g.get("x", 0),
-                    "y": g.get("y", 0),
-                    "size": g["size"],
-                    "color": color,
-                    "risk_badge": g["header"]["risk_badge"],  # filter FE
-                    "location_city": g["header"]["location_city"],
-                    "location_village": g["header"]["location_village"],
-                    "trust_score": g["header"]["trust_score"],
-                },
-            }
-        )
-
-        # Build Edges (Relasi)
-        for neighbor in g["overview"].get("neighbors", []):
-            target_name = neighbor["name"]
-            target_id = None
-
-            # Cari ID tetangga by name (Scan database)
-            for potential_id, potential_group in groups.items():
-                if potential_group["header"]["name"] == target_name:
-                    target_id = potential_id
-                    break
-
-            if target_id:
-                # Sort ID biar A->B dan B->A dianggap sama (Undirected Edge)
-                edge_tuple = sorted([gid, target_id])
-                edge_key = f"edge_{edge_tuple[0]}_{edge_tuple[1]}"
-
-                edges.append(
-                    {
-                        "key": edge_key,
-                        "source": gid,
-                        "target": target_id,
-                        "attributes": {
-                            "size": 2,
-                            "color": "#cbd5e1",
-                            "type": "line",
-                            "label": neighbor.get(
-                                "relation", "Tetangga"
-                            ),  # Label di garis"
-                        },
-                    }
-                )
-
-    # Hapus duplikat edge (karena A bertetangga B, B bertetangga A)
-    unique_edges = list({e["key"]: e for e in edges}.values())
-
-    return {"nodes": nodes, "edges": unique_edges}
+async def get_graph_topology(
+    request: Request,
+    level: Optional[str] = Query(None, description="Zoom-out level: city / village / cluster (default: group)"),
+    risk: Optional[List[str]] = Query(None, description="Node type: healthy / medium / toxic"),
+    risk_badge: Optional[List[str]] = Query(None),
+    city: Optional[List[str]] = Query(None),
+    village: Optional[List[str]] = Query(None),
+    min_trust: Optional[int] = None,
+    max_trust: Optional[int] = None,
+    bbox: Optional[str] = Query(None, description="x0,y0,x1,y1 (canvas coordinates)"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    format: Optional[str] = Query(None, description="json (default) / binary (columnar, lihat graph_binary.py)"),
+):
+    snap = data_service.snapshot
+    topo = get_topology(snap)
+    headers = {"Cache-Control": GRAPH_CACHE_CONTROL}
+    filters = dict(
+        risk=risk,
+        risk_badge=risk_badge,
+        city=city,
+        village=village,
+        min_trust=min_trust,
+        max_trust=max_trust,
+        bbox=_parse_bbox(bbox),
+    )
+
+    if format not in (None, "json", "binary"):
+        raise HTTPException(status_code=422, detail="format must be json or binary")
+    paged = limit is not None or cursor is not None
+    full_graph = not any(v is not None for v in filters.values()) and not paged and level in (None, "group")
+    if format == "binary" and not full_graph:
+        raise HTTPException(status_code=400, detail="binary format is only available for the full graph")
+
+    # Format biner kolumnar: ?format=binary, atau Accept kalau format tidak disebut
+    accept = request.headers.get("accept", "")
+    if full_graph and (format == "binary" or (format is None and GRAPH_BINARY_MEDIA_TYPE in accept)):
+        binary = get_binary_topology(snap)
+        headers["Vary"] = "Accept"
+        if etag_matches(request, binary.etag):
+            return not_modified(binary.etag, headers)
+        return encoded_response(request, binary.compressed, {"ETag": binary.etag, **headers}, GRAPH_BINARY_MEDIA_TYPE)
+
+    # Level-of-detail: super-node per kota/desa/geo-cluster (precomputed per versi data)
+    if level is not None and level != "group":
+        if level not in LOD_LEVELS:
+            raise HTTPException(status_code=422, detail=f"level must be one of: group, {', '.join(LOD_LEVELS)}")
+        if any(v is not None for v in filters.values()) or paged:
+            raise HTTPException(status_code=400, detail="level cannot be combined with filters or pagination")
+        lod = get_lod_payload(snap, level)
+        if etag_matches(request, lod.etag):
+            return not_modified(lod.etag, headers)
+        return encoded_response(request, lod.compressed, {"ETag": lod.etag, **headers})
+
+    # Tanpa filter/paging: payload penuh yang sudah di-cache
+    if full_graph:
+        headers["Vary"] = "Accept"
+        if etag_matches(request, topo.etag):
+            return not_modified(topo.etag, headers)
+        return encoded_response(request, topo.compressed, {"ETag": topo.etag, **headers})
+
+    # Hasil filter deterministik dari (versi data, query), jadi ETag bisa tanpa hitung ulang
+    query_key = hashlib.blake2b(str(sorted(request.query_params.multi_items())).encode(), digest_size=8).hexdigest()
+    tag = f'"{topo.etag.strip(QUOTE)}-{query_key}"'
+    etag = f"W/{tag}"
+    if etag_matches(request, tag):
+        return not_modified(etag, headers)
+
+    offset = _decode_cursor(cursor, topo.etag) if cursor else 0
+    rows = filter_rows(snap, **filters)
+    if offset > len(rows):
+        raise HTTPException(status_code=400, detail="Invalid cursor: offset past the filtered rows")
+    result = page_topology(snap, rows, offset, limit)
+    next_offset = result.pop("next_offset")
+    result["next_cursor"] = _encode_cursor(topo.etag, next_offset) if next_offset is not None else None
+    return Response(content=to_json_bytes(result), media_type="application/json", headers={"ETag": etag, **headers})
+
+
+@router.get("/graph/tiles/{z}/{tx}/{ty}")
+async def get_graph_tile(
+    request: Request,
+    z: int = Path(..., ge=0, le=MAX_TILE_ZOOM),
+    tx: int = Path(..., ge=0),
+    ty: int = Path(..., ge=0),
+):
+    """
+    Viewport tile of the graph canvas (2^z x 2^z tiles over the node bounding
+    box). Crowded tiles come back as cluster super-nodes ("clustered": true).
+    """
+    if tx >= (1 << z) or ty >= (1 << z):
+        raise HTTPException(status_code=404, detail="Tile out of range")
+    snap = data_service.snapshot
+    topo = get_topology(snap)
+    etag = f'"{topo.etag.strip(QUOTE)}-{z}-{tx}-{ty}"'
+    headers = {"Cache-Control": GRAPH_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
+    body = get_tile_body(snap, z, tx, ty)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag, **headers})
+
+
+@router.get("/graph/contagion")
+async def get_graph_contagion(
+    request: Request,
+    method: str = Query("ppr", description="ppr (seed: group toxic) / diffusion (100 - trust_score)"),
+    top: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Only the k most exposed groups"),
+):
+    """Risk exposure score (0..100) per group, precomputed per data version."""
+    if method not in CONTAGION_METHODS:
+        raise HTTPException(status_code=422, detail=f"method must be one of: {', '.join(CONTAGION_METHODS)}")
+    result = get_contagion(data_service.snapshot, method)
+    headers = {"Cache-Control": GRAPH_CACHE_CONTROL}
+    etag = result.etag if top is None else f'"{result.etag.strip(QUOTE)}-top{top}"'
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
+    if top is None:
+        return Response(content=result.body, media_type="application/json", headers={"ETag": etag, **headers})
+    body = to_json_bytes({**result.meta(), "top": result.top(top)})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag, **headers})
+
+
+@router.get("/graph/communities")
+async def get_graph_communities(
+    request: Request,
+    min_size: Optional[int] = Query(None, ge=1, description="Skip communities smaller than this"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Largest `limit` communities only"),
+):
+    """Connected components + label-propagation communities (ids match node attributes in /graph)."""
+    result = get_communities(data_service.snapshot)
+    headers = {"Cache-Control": GRAPH_CACHE_CONTROL}
+    if min_size is None and limit is None:
+        if etag_matches(request, result.etag):
+            return not_modified(result.etag, headers)
+        return Response(content=result.body, media_type="application/json", headers={"ETag": result.etag, **headers})
+
+    etag = f'"{result.etag.strip(QUOTE)}-{min_size}-{limit}"'
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
+    summary = orjson.loads(result.body)
+    communities = [c for c in summary["communities"] if min_size is None or c["size"] >= min_size]
+    summary["communities"] = communities[:limit]
+    return Response(content=to_json_bytes(summary), media_type="application/json", headers={"ETag": etag, **headers})
+
+
+def _parse_bbox(bbox):
+    if bbox is None:
+        return None
+    try:
+        x0, y0, x1, y1 = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="bbox must be x0,y0,x1,y1")
+    # float() menerima nan/inf, yang tidak bisa dipetakan ke sel spatial grid
+    if not all(math.isfinite(v) for v in (x0, y0, x1, y1)):
+        raise HTTPException(status_code=422, detail="bbox must be x0,y0,x1,y1")
+    return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+
+
+def _encode_cursor(etag: str, offset: int) -> str:
+    # Cursor terikat ke versi data (ETag), supaya paging tidak loncat setelah reload
+    raw = f"{etag.strip(QUOTE)[:16]}:{offset}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, etag: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        version, offset = raw.split(":")
+        offset = int(offset)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor: negative offset")
+    if version != etag.strip(QUOTE)[:16]:
+        raise HTTPException(status_code=410, detail="Cursor expired: graph data was reloaded")
+    return offset
@@ -1,14 +1,70 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from app.models.schemas import GroupDetail
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+
+from app.models.schemas import GroupBatchRequest, GroupDetail
 from app.services.data_service import data_service
+from app.services.graph_service import EGO_MAX_HOPS, get_ego_body
+from app.services.group_service import get_detail_cache, parse_fields, project_body
 
 router = APIRouter()
 
 
 @router.get("/groups/{group_id}", response_model=GroupDetail)
 async def get_group_detail(group_id: str):
+    # Sudah divalidasi + diserialisasi sekali per versi data; langsung kirim bytes
+    body = get_detail_cache(data_service.snapshot).get(group_id)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
     data = data_service.get_group_detail(group_id)
     if not data:
         raise HTTPException(status_code=404, detail="Group not found")
+    # Gagal validasi saat load: biarkan response_model melaporkan error-nya
     return data
+
+
+@router.get("/groups/{group_id}/neighborhood")
+async def get_group_neighborhood(
+    group_id: str,
+    hops: int = Query(1, ge=1, le=EGO_MAX_HOPS),
+    min_trust: Optional[int] = Query(None, description="Skip (and do not expand) groups below this trust_score"),
+):
+    """k-hop ego network of a group, in the same node/edge shape as /graph."""
+    body = get_ego_body(data_service.snapshot, group_id, hops, min_trust)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Group not found")
+    return Response(content=body, media_type="application/json")
+
+
+@router.post("/groups:batch")
+def get_group_details_batch(req: GroupBatchRequest):
+    """
+    Many group details in one round trip: {"groups": {id: detail}, "missing": [...]}.
+    `fields` projects each detail (e.g. "header,overview.metrics"); the body is
+    streamed group by group straight from the per-version JSON cache.
+    """
+    try:
+        tree = parse_fields(req.fields or "")
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    # Satu snapshot untuk seluruh batch, walau reload terjadi di tengah stream
+    cache = get_detail_cache(data_service.snapshot)
+    ids = list(dict.fromkeys(req.ids))
+
+    def stream():
+        missing = []
+        sep = b""
+        yield b'{"groups":{'
+        for gid in ids:
+            body = cache.get(gid)
+            if body is None:
+                missing.append(gid)
+                continue
+            yield sep + orjson.dumps(gid) + b":" + project_body(body, tree)
+            sep = b","
+        yield b'},"missing":' + orjson.dumps(missing) + b"}"
+
+    return StreamingResponse(stream(), media_type="application/json")
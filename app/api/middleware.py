@@ -0,0 +1,140 @@
+"""
+Response compression negotiated per request (Accept-Encoding).
+
+Response yang sudah punya Content-Encoding (payload precompressed dari cache)
+diteruskan apa adanya; selain itu body JSON/teks >= COMPRESS_MIN_SIZE
+dikompres on-the-fly, termasuk StreamingResponse (dikompres per chunk).
+"""
+import os
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.services.compression import ENCODINGS, PrecompressedBody, StreamCompressor, compress
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def negotiate_encoding(accept_encoding: str):
+    """Best supported encoding allowed by an Accept-Encoding header, or None (identity)."""
+    if not accept_encoding:
+        return None
+    q = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        q[name.strip()] = weight
+    wildcard = q.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        weight = q.get(encoding, wildcard)
+        if weight > best_q:
+            best, best_q = encoding, weight
+    return best
+
+
+def weak_etag(etag: str) -> str:
+    # Representasi terkompres beda byte; strong ETag tidak boleh sama dengan identity
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+def encoded_response(request: Request, payload: PrecompressedBody, headers: dict, media_type="application/json"):
+    """Response for a cached body, using its precompressed variant when the client accepts one."""
+    vary = headers.get("Vary")
+    headers = {**headers, "Vary": f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"}
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is None or len(payload.body) < COMPRESS_MIN_SIZE:
+        return Response(content=payload.body, media_type=media_type, headers=headers)
+    if "ETag" in headers:
+        headers["ETag"] = weak_etag(headers["ETag"])
+    headers["Content-Encoding"] = encoding
+    return Response(content=payload.encoded(encoding), media_type=media_type, headers=headers)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class _CompressResponder:
+    def __init__(self, app, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = None
+        self.start = None
+        self.mode = None  # None = belum diputuskan, "pass", "stream"
+        self.compressor = None
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message):
+        kind = message["type"]
+        if kind == "http.response.start":
+            self.start = message
+            return
+        if kind != "http.response.body" or self.mode == "pass":
+            await self.send(message)
+            return
+        if self.mode == "stream":
+            more = message.get("more_body", False)
+            chunk = self.compressor.process(message.get("body", b""))
+            if not more:
+                chunk += self.compressor.finish()
+            if chunk or not more:
+                await self.send({"type": "http.response.body", "body": chunk, "more_body": more})
+            return
+
+        # Body pertama: putuskan kompres atau tidak
+        body, more = message.get("body", b""), message.get("more_body", False)
+        headers = MutableHeaders(raw=self.start["headers"])
+        compressible = (
+            self.start["status"] not in (204, 206, 304)
+            and "content-encoding" not in headers
+            and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        )
+        if compressible:
+            headers.add_vary_header("Accept-Encoding")
+        if not compressible or (not more and len(body) < self.minimum_size):
+            self.mode = "pass"
+            await self.send(self.start)
+            await self.send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        if "etag" in headers:
+            headers["ETag"] = weak_etag(headers["etag"])
+        if not more:
+            self.mode = "pass"
+            body = compress(body, self.encoding)
+            headers["Content-Length"] = str(len(body))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        self.mode = "stream"
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        self.compressor = StreamCompressor(self.encoding)
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": self.compressor.process(body), "more_body": True})
@@ -1,13 +1,47 @@
+import asyncio
+import contextlib
+import logging
 import os
-from fastapi import FastAPI, HTTPException
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
-import logging
-
-from app.api import graph, groups
 
-app = FastAPI(title="SocialCollateral AI - Backend", version="1.0.0")
+from app.api import admin, graph, groups
+from app.api.caching import etag_matches, not_modified
+from app.api.middleware import CompressionMiddleware
+from app.api.responses import OrjsonResponse
+from app.services.data_service import MOCK_DB_WATCH_INTERVAL, data_service
+from app.services.image_service import IMAGE_CACHE_MAX_AGE, IMAGE_WATCH_INTERVAL, image_service
+from app.services.thumbnail_service import THUMB_DEFAULT_QUALITY, THUMB_MAX_DIM, negotiate_format, thumbnail_service
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm derived caches + image index off the event loop, then watch for reseeds
+    await asyncio.to_thread(data_service.warm, data_service.snapshot)
+    await asyncio.to_thread(image_service.refresh)
+    watchers = []
+    if MOCK_DB_WATCH_INTERVAL > 0:
+        watchers.append(asyncio.create_task(data_service.watch()))
+    if IMAGE_WATCH_INTERVAL > 0:
+        watchers.append(asyncio.create_task(image_service.watch()))
+    yield
+    for watcher in watchers:
+        watcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await watcher
+    thumbnail_service.shutdown()
+
+
+app = FastAPI(
+    title="SocialCollateral AI - Backend",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=OrjsonResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,9 +50,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# gzip/br sesuai Accept-Encoding; payload graph yang di-cache sudah precompressed
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(graph.router, prefix="/api/v1")
 app.include_router(groups.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -32,71 +69,72 @@ def health_check():
 
 
 @app.get("/images/{filename}")
-async def get_image(filename: str):
+async def get_image(
+    filename: str,
+    request: Request,
+    w: Optional[int] = Query(None, ge=1, le=THUMB_MAX_DIM),
+    h: Optional[int] = Query(None, ge=1, le=THUMB_MAX_DIM),
+    q: Optional[int] = Query(None, ge=1, le=100),
+):
     """
     Simple endpoint to serve images directly
     Usage: /images/placeholder_home.jpg or /images/sample1.jpg
+    Thumbnail: /images/house_0.jpg?w=320 (WebP/AVIF kalau Accept mengizinkan)
     """
-    # Try different directories and common extensions so requests like
-    # /images/house_0.jpg will match files named house_0.jpeg, house_0.png, etc.
-    possible_dirs = [
-        os.path.join("data", "images"),
-        os.path.join("data", "images", "home"),
-        os.path.join("data", "images", "bisnis"),
-    ]
-
-    # Common extensions to try when the requested name might differ
-    common_exts = [".jpg", ".jpeg", ".png", ".webp"]
-
-    # First, try the filename exactly as provided in each directory
-    for d in possible_dirs:
-        path_exact = os.path.join(d, filename)
-        logging.info("Looking for image: %s", path_exact)
-        if os.path.exists(path_exact):
-            logging.info("Found image: %s", path_exact)
-            return FileResponse(path_exact)
-
-    # Split name/extension and try variations
-    name, ext = os.path.splitext(filename)
-
-    # If caller didn't provide an extension, try common ones
-    if not ext:
-        for d in possible_dirs:
-            for e in common_exts:
-                p = os.path.join(d, name + e)
-                if os.path.exists(p):
-                    return FileResponse(p)
-    else:
-        # Caller provided an extension; also try alternative extensions
-        for d in possible_dirs:
-            for e in common_exts:
-                if e == ext.lower():
-                    continue
-                p = os.path.join(d, name + e)
-                if os.path.exists(p):
-                    return FileResponse(p)
-
-    # Not found
-    logging.warning("Image not found for request '%s'. Attempted dirs: %s", filename, possible_dirs)
-    raise HTTPException(status_code=404, detail=f"Image {filename} not found")
+    # Resolusi lewat index (data/images, home, bisnis + ekstensi alternatif),
+    # jadi /images/house_0.jpg tetap ketemu house_0.jpeg, house_0.png, dst.
+    entry = image_service.resolve(filename)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Image {filename} not found")
+
+    if w is not None or h is not None or q is not None:
+        return await _get_thumbnail(entry, request, w, h, q or THUMB_DEFAULT_QUALITY)
+
+    headers = {"ETag": entry.etag, "Cache-Control": f"public, max-age={IMAGE_CACHE_MAX_AGE}"}
+    if etag_matches(request, entry.etag) or (
+        "if-none-match" not in request.headers and _not_modified_since(request, entry.stat.st_mtime)
+    ):
+        return not_modified(entry.etag, {"Cache-Control": headers["Cache-Control"]})
+    return FileResponse(entry.path, headers=headers, stat_result=entry.stat)
+
+
+async def _get_thumbnail(entry, request: Request, w, h, q):
+    fmt = negotiate_format(request.headers.get("accept"), entry.path)
+    etag = f'"{thumbnail_service.variant_key(entry, w, h, q, fmt)}"'
+    # Format tergantung Accept, jadi cache di depan harus membedakannya
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={IMAGE_CACHE_MAX_AGE}", "Vary": "Accept"}
+    if etag_matches(request, etag):
+        return not_modified(etag, {"Cache-Control": headers["Cache-Control"], "Vary": "Accept"})
+    try:
+        path, media_type, _ = await thumbnail_service.render(entry, w, h, q, fmt)
+    except (OSError, ValueError) as e:
+        # Pillow: UnidentifiedImageError turunan OSError
+        logging.warning("Thumbnail failed for %s: %s", entry.path, e)
+        raise HTTPException(status_code=422, detail="Image cannot be resized")
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+def _not_modified_since(request: Request, mtime: float) -> bool:
+    header = request.headers.get("if-modified-since")
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # Last-Modified presisi detik
+    return int(mtime) <= since
 
 
 @app.get("/debug/images")
 def list_images():
     """Debug endpoint: returns files under data/images and subdirectories.
     Use to verify which images are packaged into the running container.
+    Served from the image index (as of the last watcher scan), not a fresh walk.
     """
-    root = os.path.join("data", "images")
-    result = {}
-    if not os.path.exists(root):
+    if not os.path.exists(image_service.root):
         return {"exists": False, "message": "data/images not present in container"}
-
-    for dirpath, dirnames, filenames in os.walk(root):
-        rel = os.path.relpath(dirpath, root)
-        key = rel if rel != "." else "root"
-        result[key] = filenames
-
-    return {"exists": True, "files": result}
+    return {"exists": True, "files": image_service.index.listing()}
 
 
 # Serve static images folder so URLs like /static/images/<subpath>
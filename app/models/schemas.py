@@ -1,6 +1,6 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 # Sub-Models untuk Detail Group
@@ -75,6 +75,16 @@ class GroupDetail(BaseModel):
     y: Optional[int] = 0
 
 
+# Bulk detail: POST /groups:batch
+MAX_BATCH_IDS = 500
+
+
+class GroupBatchRequest(BaseModel):
+    ids: List[str] = Field(..., max_length=MAX_BATCH_IDS)
+    # Projection dotted path, mis. "header,trends.repayment_history" (kosong = GroupDetail penuh)
+    fields: Optional[Union[str, List[str]]] = None
+
+
 # Graph Specific Models
 class GraphNodeAttributes(BaseModel):
     label: str
@@ -83,6 +93,9 @@ class GraphNodeAttributes(BaseModel):
     size: int
     color: str
     risk_badge: str
+    # Hasil stage komunitas (communities.py)
+    community: Optional[int] = None
+    component: Optional[int] = None
 
 
 class GraphNode(BaseModel):
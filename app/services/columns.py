@@ -0,0 +1,299 @@
+"""
+Columnar in-memory store for the hot group fields.
+
+Satu baris per group; field numerik disimpan di array NumPy, field kategori
+(type, risk badge, kota, desa, ...) di-intern jadi kode integer. Neighbor
+disimpan sebagai CSR (nbr_ptr / nbr_row) yang sudah di-resolve ke nomor baris,
+jadi graph/filter/stats tidak perlu menyentuh dict per group.
+"""
+from collections.abc import Mapping
+
+import numpy as np
+
+# Default label edge kalau neighbor tidak punya "relation" (sama dengan graph lama)
+DEFAULT_RELATION = "Tetangga"
+
+
+class StringTable:
+    """Intern table: string <-> small integer code."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def code(self, value) -> int:
+        c = self._codes.get(value)
+        if c is None:
+            c = len(self.values)
+            self._codes[value] = c
+            self.values.append(value)
+        return c
+
+    def lookup(self, value):
+        """Code for `value`, or None if it never occurred (useful for filters)."""
+        return self._codes.get(value)
+
+    def __getitem__(self, code: int):
+        return self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class GroupColumns:
+    """
+    Build with append() per group (streaming friendly), then freeze() once.
+    After freeze() the arrays below are read-only and safe to share.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.names = []
+        self.row_of = {}
+        self.name_to_id = {}
+
+        self.types = StringTable()
+        self.badges = StringTable()
+        self.cities = StringTable()
+        self.villages = StringTable()
+        self.eligibility = StringTable()
+        self.priority = StringTable()
+        self.relations = StringTable()
+        self.risks = StringTable()
+        self.distances = StringTable()
+
+        self._cols = {name: [] for name in _ROW_DTYPES}
+        self._nbr_ptr = [0]
+        self._nbr_raw = []  # (id, name) belum di-resolve sampai freeze()
+        self._nbr_rel = []
+        self._nbr_risk = []
+        self._nbr_dist = []
+
+    @classmethod
+    def from_groups(cls, groups):
+        cols = cls()
+        for g in groups:
+            cols.append(g)
+        return cols.freeze()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, g: dict):
+        header = g.get("header", {})
+        gid = g["id"]
+        self.row_of[gid] = len(self.ids)
+        self.ids.append(gid)
+        self.names.append(header.get("name"))
+
+        c = self._cols
+        c["trust_score"].append(header.get("trust_score") or 0)
+        c["size"].append(g.get("size") or 0)
+        c["x"].append(g.get("x") or 0)
+        c["y"].append(g.get("y") or 0)
+        c["lat"].append(g.get("lat", np.nan))
+        c["lng"].append(g.get("lng", np.nan))
+        c["member_count"].append(header.get("member_count") or 0)
+        c["total_loan_amount"].append(header.get("total_loan_amount") or 0)
+        c["type_code"].append(self.types.code(g.get("type")))
+        c["badge_code"].append(self.badges.code(header.get("risk_badge")))
+        c["city_id"].append(self.cities.code(header.get("location_city")))
+        c["village_id"].append(self.villages.code(header.get("location_village")))
+        c["eligibility_code"].append(self.eligibility.code(header.get("loan_eligibility")))
+        c["priority_code"].append(self.priority.code(header.get("visual_priority")))
+
+        for n in g.get("overview", {}).get("neighbors", []):
+            self._nbr_raw.append((n.get("id"), n.get("name")))
+            self._nbr_rel.append(self.relations.code(n.get("relation", DEFAULT_RELATION)))
+            self._nbr_risk.append(self.risks.code(n.get("risk")))
+            self._nbr_dist.append(self.distances.code(n.get("distance")))
+        self._nbr_ptr.append(len(self._nbr_raw))
+
+    def freeze(self):
+        for name, dtype in _ROW_DTYPES.items():
+            setattr(self, name, _frozen(self._cols[name], dtype))
+        del self._cols
+
+        for gid, name in zip(self.ids, self.names):
+            self.name_to_id.setdefault(name, gid)
+
+        # Resolve neighbor -> row: pakai neighbor.id, fallback nama (DB lama); -1 = tidak ketemu
+        row_of, name_to_id = self.row_of, self.name_to_id
+        rows = []
+        for nid, name in self._nbr_raw:
+            row = row_of.get(nid)
+            if row is None:
+                row = row_of.get(name_to_id.get(name), -1)
+            rows.append(row)
+        self.nbr_ptr = _frozen(self._nbr_ptr, np.int64)
+        self.nbr_row = _frozen(rows, np.int32)
+        self.nbr_rel = _frozen(self._nbr_rel, np.int16)
+        self.nbr_risk = _frozen(self._nbr_risk, np.int16)
+        self.nbr_dist = _frozen(self._nbr_dist, np.int16)
+        del self._nbr_ptr, self._nbr_raw, self._nbr_rel, self._nbr_risk, self._nbr_dist
+        return self
+
+    def view(self, row: int) -> "GroupView":
+        return GroupView(self, row)
+
+    def get(self, group_id: str):
+        row = self.row_of.get(group_id)
+        return None if row is None else GroupView(self, row)
+
+    def summaries(self) -> "GroupSummaries":
+        return GroupSummaries(self)
+
+
+class GroupView:
+    """Read-only per-group view over GroupColumns (no per-group dict)."""
+
+    __slots__ = ("_cols", "row")
+
+    def __init__(self, cols: GroupColumns, row: int):
+        self._cols = cols
+        self.row = row
+
+    @property
+    def id(self):
+        return self._cols.ids[self.row]
+
+    @property
+    def name(self):
+        return self._cols.names[self.row]
+
+    @property
+    def type(self):
+        return self._cols.types[self._cols.type_code[self.row]]
+
+    @property
+    def risk_badge(self):
+        return self._cols.badges[self._cols.badge_code[self.row]]
+
+    @property
+    def city(self):
+        return self._cols.cities[self._cols.city_id[self.row]]
+
+    @property
+    def village(self):
+        return self._cols.villages[self._cols.village_id[self.row]]
+
+    @property
+    def trust_score(self):
+        return int(self._cols.trust_score[self.row])
+
+    @property
+    def size(self):
+        return int(self._cols.size[self.row])
+
+    @property
+    def x(self):
+        return int(self._cols.x[self.row])
+
+    @property
+    def y(self):
+        return int(self._cols.y[self.row])
+
+    @property
+    def lat(self):
+        return float(self._cols.lat[self.row])
+
+    @property
+    def lng(self):
+        return float(self._cols.lng[self.row])
+
+    def neighbor_rows(self):
+        c = self._cols
+        start, end = c.nbr_ptr[self.row], c.nbr_ptr[self.row + 1]
+        return [int(r) for r in c.nbr_row[start:end] if r >= 0]
+
+    def to_summary(self) -> dict:
+        """Same shape as db_store.summarize_group() for resolvable neighbors."""
+        c, r = self._cols, self.row
+        header = {
+            "name": c.names[r],
+            "location_city": self.city,
+            "location_village": self.village,
+            "member_count": int(c.member_count[r]),
+            "risk_badge": self.risk_badge,
+            "trust_score": int(c.trust_score[r]),
+            "loan_eligibility": c.eligibility[c.eligibility_code[r]],
+            "total_loan_amount": int(c.total_loan_amount[r]),
+            "visual_priority": c.priority[c.priority_code[r]],
+        }
+        neighbors = []
+        for k in range(c.nbr_ptr[r], c.nbr_ptr[r + 1]):
+            nrow = c.nbr_row[k]
+            if nrow < 0:
+                continue
+            neighbors.append(
+                {
+                    "id": c.ids[nrow],
+                    "name": c.names[nrow],
+                    "risk": c.risks[c.nbr_risk[k]],
+                    "distance": c.distances[c.nbr_dist[k]],
+                    "relation": c.relations[c.nbr_rel[k]],
+                }
+            )
+        summary = {
+            "id": c.ids[r],
+            "type": self.type,
+            "size": self.size,
+            "x": self.x,
+            "y": self.y,
+            "lat": self.lat,
+            "lng": self.lng,
+            "header": {k: v for k, v in header.items() if v is not None},
+            "overview": {"neighbors": neighbors},
+        }
+        for key in ("lat", "lng"):
+            if np.isnan(summary[key]):
+                del summary[key]
+        return summary
+
+
+class GroupSummaries(Mapping):
+    """gid -> summary dict, materialized on access from the columns."""
+
+    def __init__(self, cols: GroupColumns):
+        self._cols = cols
+
+    def __getitem__(self, group_id):
+        row = self._cols.row_of.get(group_id)
+        if row is None:
+            raise KeyError(group_id)
+        return GroupView(self._cols, row).to_summary()
+
+    def __contains__(self, group_id):
+        return group_id in self._cols.row_of
+
+    def __iter__(self):
+        return iter(self._cols.ids)
+
+    def __len__(self):
+        return len(self._cols.ids)
+
+
+_ROW_DTYPES = {
+    "trust_score": np.int16,
+    "size": np.int16,
+    "x": np.int32,
+    "y": np.int32,
+    "lat": np.float64,
+    "lng": np.float64,
+    "member_count": np.int16,
+    "total_loan_amount": np.int64,
+    "type_code": np.int16,
+    "badge_code": np.int16,
+    "city_id": np.int32,
+    "village_id": np.int32,
+    "eligibility_code": np.int16,
+    "priority_code": np.int16,
+}
+
+
+def _frozen(values, dtype):
+    arr = np.asarray(values, dtype=dtype)
+    arr.flags.writeable = False
+    return arr
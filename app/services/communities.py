@@ -0,0 +1,196 @@
+"""
+Connected components + komunitas group, dihitung sekali per versi data.
+
+- Komponen : union-find vektor (hook root ke root terkecil lewat
+             np.minimum.at, lalu pointer jumping sampai stabil)
+- Komunitas: label propagation berbobot relasi; relasi "rapat" (Same Village,
+             Geo-Cluster, Shared Agent) bobot penuh, relasi lain lebih kecil.
+             Tiap ronde hanya separuh node (acak, seed tetap) yang update,
+             supaya tidak berosilasi seperti LPA sinkron murni.
+
+Id komponen/komunitas dinomori ulang 0..k-1 menurut baris pertama anggotanya
+dan disimpan di objek Communities (per snapshot, lewat snapshot.derived);
+column store tidak diubah. Topologi /graph membacanya dari sini sebagai
+atribut node.
+"""
+import hashlib
+import os
+
+import numpy as np
+import orjson
+
+from app.services.data_service import data_service
+from app.services.graph_index import get_edge_table
+
+RELATION_WEIGHTS = {"Same Village": 1.0, "Geo-Cluster": 1.0, "Shared Agent": 1.0}
+DEFAULT_RELATION_WEIGHT = 0.25
+LPA_MAX_ROUNDS = int(os.getenv("LPA_MAX_ROUNDS", "20"))
+# Berhenti kalau porsi node yang masih ingin ganti label di bawah ini
+LPA_MIN_CHANGE = 0.001
+LPA_SEED = 0
+
+
+class Communities:
+    def __init__(self, snapshot):
+        cols = snapshot.columns
+        edges = get_edge_table(snapshot)
+        n = len(cols)
+        self.component = _frozen(_relabel(connected_components(n, edges.src, edges.dst)))
+
+        weight_of = np.array(
+            [RELATION_WEIGHTS.get(r, DEFAULT_RELATION_WEIGHT) for r in cols.relations.values] or [0.0]
+        )
+        slot_row = np.repeat(np.arange(n), edges.degree())
+        slot_weight = weight_of[edges.rel[edges.adj_edge]] if len(edges) else np.empty(0)
+        labels, self.rounds = label_propagation(n, slot_row, edges.adj_row, slot_weight)
+        self.community = _frozen(_relabel(labels))
+        self.component_count = int(self.component.max()) + 1 if n else 0
+        self.community_count = int(self.community.max()) + 1 if n else 0
+        self.body = orjson.dumps(self._summary(cols, edges))
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=16).hexdigest()}"'
+
+    def _summary(self, cols, edges) -> dict:
+        n = len(cols)
+        comm = self.community
+        sizes = np.bincount(comm, minlength=self.community_count)
+        trust_sum = np.bincount(comm, weights=cols.trust_score.astype(np.float64), minlength=self.community_count)
+        loan_sum = np.bincount(comm, weights=cols.total_loan_amount.astype(np.float64), minlength=self.community_count)
+        same = comm[edges.src] == comm[edges.dst]
+        internal = np.bincount(comm[edges.src[same]], minlength=self.community_count)
+        cut = np.bincount(comm[edges.src[~same]], minlength=self.community_count) + np.bincount(
+            comm[edges.dst[~same]], minlength=self.community_count
+        )
+        type_mix = _mix(comm, cols.type_code, cols.types.values, self.community_count)
+        top_city = _dominant(comm, cols.city_id, cols.cities.values, self.community_count)
+        top_village = _dominant(comm, cols.village_id, cols.villages.values, self.community_count)
+        first_row = np.full(self.community_count, n, dtype=np.int64)
+        np.minimum.at(first_row, comm, np.arange(n))
+
+        order = np.argsort(-sizes, kind="stable")
+        communities = [
+            {
+                "id": int(c),
+                "component": int(self.component[first_row[c]]),
+                "size": int(sizes[c]),
+                "internal_edges": int(internal[c]),
+                "cut_edges": int(cut[c]),
+                "avg_trust_score": round(float(trust_sum[c] / sizes[c]), 1),
+                "total_loan_amount": int(loan_sum[c]),
+                "risk_mix": type_mix[c],
+                "location_city": top_city[c],
+                "location_village": top_village[c],
+            }
+            for c in order.tolist()
+        ]
+        comp_sizes = np.sort(np.bincount(self.component, minlength=self.component_count))[::-1]
+        return {
+            "group_count": n,
+            "component_count": self.component_count,
+            "largest_components": comp_sizes[:10].tolist(),
+            "isolated_groups": int((comp_sizes == 1).sum()),
+            "community_count": self.community_count,
+            "lpa_rounds": self.rounds,
+            "communities": communities,
+        }
+
+
+def get_communities(snapshot) -> Communities:
+    return snapshot.derived("communities", Communities)
+
+
+data_service.add_warmer(get_communities)
+
+
+def connected_components(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Root (smallest row) of every row's component."""
+    parent = np.arange(n, dtype=np.int64)
+    src, dst = src.astype(np.int64), dst.astype(np.int64)
+    while True:
+        ru, rv = parent[src], parent[dst]
+        active = ru != rv
+        if not active.any():
+            return parent
+        ru, rv = ru[active], rv[active]
+        # Hook: root yang lebih besar menunjuk ke root terkecil tetangganya
+        np.minimum.at(parent, np.maximum(ru, rv), np.minimum(ru, rv))
+        # Path compression penuh
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+        src, dst = src[active], dst[active]
+
+
+def label_propagation(n: int, slot_row, slot_nbr, slot_weight, max_rounds: int = LPA_MAX_ROUNDS):
+    """Weighted LPA over adjacency slots; returns (labels, rounds). Ties go to the smaller label."""
+    labels = np.arange(n, dtype=np.int64)
+    rng = np.random.default_rng(LPA_SEED)
+    slot_row = slot_row.astype(np.int64)
+    if not len(slot_row):
+        return labels, 0
+    rounds = 0
+    for rounds in range(1, max_rounds + 1):
+        # Bobot per (row, label): urutkan pasangan (satu key int64) lalu jumlahkan per run
+        key = slot_row * n + labels[slot_nbr]
+        order = np.argsort(key)
+        key = key[order]
+        run_start = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        run_row, run_lab = key[run_start] // n, key[run_start] % n
+        run_w = np.add.reduceat(slot_weight[order], run_start)
+
+        # Per row: bobot terbesar; run urut label, jadi run pertama yang menyamai = label terkecil
+        row_start = np.flatnonzero(np.r_[True, run_row[1:] != run_row[:-1]])
+        best_w = np.zeros(n)
+        best_w[run_row[row_start]] = np.maximum.reduceat(run_w, row_start)
+        top = np.flatnonzero(run_w >= best_w[run_row])
+        top = top[np.r_[True, run_row[top][1:] != run_row[top][:-1]]]
+        candidate = labels.copy()
+        candidate[run_row[top]] = run_lab[top]
+        # Label lama tetap kalau bobotnya sama dengan yang terbaik (stabil)
+        cur_w = np.zeros(n)
+        mine = run_lab == labels[run_row]
+        cur_w[run_row[mine]] = run_w[mine]
+        keep = cur_w >= best_w
+        candidate[keep] = labels[keep]
+
+        # Konvergen = hampir tidak ada node yang masih ingin ganti label; dihitung
+        # sebelum undian, karena ronde yang kebetulan tidak memilih node itu bukan konvergen
+        pending = candidate != labels
+        if pending.sum() < LPA_MIN_CHANGE * n:
+            break
+        update = pending & (rng.random(n) < 0.5)
+        labels[update] = candidate[update]
+    return labels, rounds
+
+
+def _relabel(roots: np.ndarray) -> np.ndarray:
+    """Dense ids 0..k-1 in order of each group's first row."""
+    _, first, inverse = np.unique(roots, return_index=True, return_inverse=True)
+    rank = np.empty(len(first), dtype=np.int64)
+    rank[np.argsort(first, kind="stable")] = np.arange(len(first))
+    return rank[inverse].astype(np.int32)
+
+
+def _mix(comm, codes, values, k) -> list:
+    counts = np.zeros((k, len(values)), dtype=np.int64)
+    np.add.at(counts, (comm, codes), 1)
+    return [{values[j]: int(c[j]) for j in np.flatnonzero(c).tolist()} for c in counts]
+
+
+def _dominant(comm, codes, values, k) -> list:
+    pair = comm.astype(np.int64) * max(len(values), 1) + codes
+    uniq, counts = np.unique(pair, return_counts=True)
+    owner, code = uniq // max(len(values), 1), uniq % max(len(values), 1)
+    best = np.lexsort((code, -counts, owner))
+    first = best[np.r_[True, owner[best][1:] != owner[best][:-1]]] if len(best) else best
+    result = [None] * k
+    for c, v in zip(owner[first].tolist(), code[first].tolist()):
+        result[c] = values[v]
+    return result
+
+
+def _frozen(arr):
+    arr = np.ascontiguousarray(arr)
+    arr.flags.writeable = False
+    return arr
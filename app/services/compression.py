@@ -0,0 +1,72 @@
+"""
+Codec kompresi response: gzip selalu ada, brotli kalau modul `brotli`
+terpasang (opsional). Dipakai middleware (kompres per request) dan payload
+cache (kompres sekali per versi data).
+"""
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:  # opsional: tanpa brotli cukup gzip
+    brotli = None
+
+# Level on-the-fly: murah di CPU; precompress sekali per versi data: lebih rapat
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+PRECOMPRESS_GZIP_LEVEL = 9
+PRECOMPRESS_BROTLI_QUALITY = 9
+
+# Urutan = preferensi server kalau client sama-sama menerima
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(body: bytes, encoding: str, precompress: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=PRECOMPRESS_BROTLI_QUALITY if precompress else BROTLI_QUALITY)
+    if encoding == "gzip":
+        c = zlib.compressobj(PRECOMPRESS_GZIP_LEVEL if precompress else GZIP_LEVEL, zlib.DEFLATED, 31)
+        return c.compress(body) + c.flush()
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class StreamCompressor:
+    """Incremental compressor for streamed bodies (same API for gzip and br)."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._c = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def process(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._c.process(chunk)
+        return self._c.compress(chunk)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._c.finish()
+        return self._c.flush()
+
+
+class PrecompressedBody:
+    """Immutable body plus its compressed variants, each built once on first use."""
+
+    __slots__ = ("body", "_variants")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._variants = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        # Race dua thread cuma berarti kompres dua kali; hasilnya identik
+        data = self._variants.get(encoding)
+        if data is None:
+            data = self._variants[encoding] = compress(self.body, encoding, precompress=True)
+        return data
+
+    def warm(self):
+        for encoding in ENCODINGS:
+            self.encoded(encoding)
@@ -1,27 +1,187 @@
-import json
+import asyncio
+import itertools
 import os
+import threading
 
-MOCK_DB_PATH = "data/mock_db.json"
+from app.services.columns import GroupColumns
+from app.services.db_store import is_jsonl, pick_db_path, read_db_eager, read_db_lazy
+
+MOCK_DB_PATH = os.getenv("MOCK_DB_PATH", "data/mock_db.json")
+# Varian JSON-lines (ditulis seeder), dipakai kalau ada dan tidak lebih lama dari .json
+MOCK_DB_JSONL_PATH = os.getenv("MOCK_DB_JSONL_PATH", "data/mock_db.jsonl")
+# "eager" = detail semua group di memori (JSON ringkas per group); "lazy" = detail
+# dibaca dari mock_db.jsonl via offset index (hanya untuk sumber JSONL).
+# Keduanya menyimpan ringkasan group sebagai kolom, tanpa dict per group.
+MOCK_DB_STORAGE = os.getenv("MOCK_DB_STORAGE", "eager")
+# Interval polling mtime mock_db.json (detik); 0 = watcher mati
+MOCK_DB_WATCH_INTERVAL = float(os.getenv("MOCK_DB_WATCH_INTERVAL", "5"))
+
+_versions = itertools.count(1)
+
+
+class DataSnapshot:
+    """
+    Immutable view of one loaded mock_db.json plus everything derived from it.
+    Reload = build a new snapshot and swap the reference, so derived caches
+    (topology, etc.) are invalidated together with the data.
+    """
+
+    def __init__(self, data: dict, source_path=None, source_stat=None, columns=None, detail_store=None):
+        self.data = data
+        self.groups = data.get("groups", {})
+        # Field panas (skor, koordinat, kode kategori, neighbor CSR) dalam bentuk kolom
+        self.columns = columns or GroupColumns.from_groups(self.groups.values())
+        self.name_to_id = self.columns.name_to_id
+        # Snapshot hasil load: self.groups hanya ringkasan dari kolom, record lengkap ada di detail_store
+        self.detail_store = detail_store
+        self.source_path = source_path
+        self.source_stat = source_stat
+        self.version = next(_versions)
+        # Snapshot yang sedang live saat snapshot ini di-warm (untuk build inkremental)
+        self.previous = None
+        self._derived = {}
+        self._lock = threading.RLock()
+
+    def derived(self, key, factory):
+        """Compute `factory(self)` once per snapshot and memoize it under `key`."""
+        value = self._derived.get(key)
+        if value is None:
+            with self._lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = factory(self)
+                    self._derived[key] = value
+        return value
+
+    def peek(self, key):
+        """Already-computed derived value for `key`, or None (never computes)."""
+        return self._derived.get(key)
 
 
 class DataService:
+    """
+    Handlers should read `self.snapshot` once per request and work on that
+    object; a reload never mutates an existing snapshot, it replaces it.
+    """
+
     def __init__(self):
-        self.data = {}
+        self.snapshot = DataSnapshot({})
+        self._warmers = []
+        self._reload_lock = None
+        self._failed_stat = None
         self.load_data()
 
+    @property
+    def data(self):
+        return self.snapshot.data
+
+    @property
+    def name_to_id(self):
+        return self.snapshot.name_to_id
+
+    def add_warmer(self, fn):
+        """Register `fn(snapshot)`, run on every new snapshot before it goes live."""
+        self._warmers.append(fn)
+        return fn
+
     def load_data(self):
-        if os.path.exists(MOCK_DB_PATH):
-            with open(MOCK_DB_PATH, "r") as f:
-                self.data = json.load(f)
-            print("Mock Data Loaded into Memory")
+        path = pick_db_path(MOCK_DB_PATH, MOCK_DB_JSONL_PATH)
+        if path:
+            self.snapshot = self._read_snapshot(path)
+            print(f"Mock Data Loaded into Memory ({path})")
         else:
             print("Mock Data Not Found. Run seeder first.")
 
+    def _read_snapshot(self, path):
+        stat = _stat_key(path)
+        if MOCK_DB_STORAGE == "lazy" and is_jsonl(path):
+            data, columns, store = read_db_lazy(path)
+        else:
+            if MOCK_DB_STORAGE == "lazy":
+                print(f"Lazy storage needs a .jsonl DB; loading {path} eagerly")
+            data, columns, store = read_db_eager(path)
+        snap = DataSnapshot(data, source_path=path, source_stat=stat, columns=columns, detail_store=store)
+        # Warmer boleh membaca snapshot lama untuk update inkremental; link dilepas
+        # setelahnya supaya snapshot lama bisa di-GC
+        snap.previous = self.snapshot
+        try:
+            self.warm(snap)
+        finally:
+            snap.previous = None
+        return snap
+
+    def warm(self, snap):
+        for warm in self._warmers:
+            warm(snap)
+
+    def needs_reload(self):
+        path = pick_db_path(MOCK_DB_PATH, MOCK_DB_JSONL_PATH)
+        if path is None:
+            return False
+        if path != self.snapshot.source_path:
+            return True
+        return _stat_key(path) not in (self.snapshot.source_stat, self._failed_stat)
+
+    async def reload(self, force: bool = False) -> bool:
+        """
+        Parse + index + warm the new DB in a worker thread, then swap the
+        snapshot in a single assignment. Returns True if a new snapshot went live.
+        """
+        if self._reload_lock is None:
+            self._reload_lock = asyncio.Lock()
+        async with self._reload_lock:
+            if not force and not self.needs_reload():
+                return False
+            path = pick_db_path(MOCK_DB_PATH, MOCK_DB_JSONL_PATH)
+            if path is None:
+                return False
+            try:
+                snap = await asyncio.to_thread(self._read_snapshot, path)
+            except (OSError, ValueError, KeyError) as e:
+                # File mungkin masih ditulis seeder; snapshot lama tetap dipakai
+                self._failed_stat = _stat_key(path)
+                print(f"Mock Data reload failed, keeping version {self.snapshot.version}: {e}")
+                return False
+            self.snapshot = snap
+            print(f"Mock Data Reloaded (version {snap.version}, {len(snap.groups)} groups)")
+            return True
+
+    async def watch(self, interval: float = MOCK_DB_WATCH_INTERVAL):
+        """Poll the DB file's mtime/size and hot-reload when it changes."""
+        while True:
+            await asyncio.sleep(interval)
+            if self.needs_reload():
+                await self.reload()
+
     def get_all_groups(self):
-        return self.data.get("groups", {})
+        # Lazy mode: ringkasan saja (tanpa trends/insights/decision)
+        return self.snapshot.groups
 
     def get_group_detail(self, group_id: str):
-        return self.data.get("groups", {}).get(group_id)
+        snap = self.snapshot
+        if snap.detail_store is not None:
+            return snap.detail_store.get(group_id)
+        return snap.groups.get(group_id)
+
+    def resolve_neighbor_id(self, neighbor: dict):
+        snap = self.snapshot
+        return resolve_neighbor_id(neighbor, snap.groups, snap.name_to_id)
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def resolve_neighbor_id(neighbor: dict, groups: dict, name_to_id: dict):
+    # Seeder sudah menulis neighbor.id; fallback ke nama untuk DB lama
+    nid = neighbor.get("id")
+    if nid in groups:
+        return nid
+    return name_to_id.get(neighbor.get("name"))
 
 
 data_service = DataService()
@@ -0,0 +1,236 @@
+"""
+File formats for the group database.
+
+- mock_db.json  : satu dokumen JSON {"meta", "global_state", "groups": {gid: group}}
+- mock_db.jsonl : JSON-lines; baris 1 = {"meta", "global_state"}, lalu satu
+                  group per baris. Bisa dibaca streaming, satu group per kali,
+                  tanpa menahan seluruh teks file di memori.
+
+Mode "lazy" (JSONL saja): yang disimpan di memori hanya ringkasan group
+dalam bentuk kolom (lihat columns.GroupColumns) + index byte offset per
+baris; record lengkap dibaca dari file (mmap) saat detail group diminta.
+
+Mode "eager": ringkasan juga dari kolom, record lengkap disimpan di memori
+sebagai JSON ringkas per group (MemoryDetailStore), bukan nested dict.
+"""
+import json
+import mmap
+import os
+from array import array
+
+from app.services.columns import GroupColumns
+
+# Ukuran batch baris JSONL yang di-decode sekaligus
+JSONL_BATCH_BYTES = 1 << 20
+
+# Field yang dibutuhkan list/graph; trends, insights, decision tetap di disk
+SUMMARY_FIELDS = ("id", "type", "size", "x", "y", "lat", "lng", "header")
+
+
+def is_jsonl(path: str) -> bool:
+    return path.endswith(".jsonl")
+
+
+def pick_db_path(json_path: str, jsonl_path: str):
+    """Prefer the JSON-lines DB unless the plain JSON one is newer (or the only one)."""
+    candidates = [p for p in (jsonl_path, json_path) if p and os.path.exists(p)]
+    if not candidates:
+        return None
+    # max() keeps the first on ties, so JSONL wins when both were written together
+    return max(candidates, key=lambda p: os.stat(p).st_mtime_ns)
+
+
+def read_db(path: str) -> dict:
+    if not is_jsonl(path):
+        with open(path, "r") as f:
+            return json.load(f)
+    with open(path, "r") as f:
+        header, groups = _read_header(f), {}
+        for g in iter_jsonl_groups(f):
+            groups[g["id"]] = g
+    return {**header, "groups": groups}
+
+
+def iter_jsonl_groups(f, batch_bytes: int = JSONL_BATCH_BYTES):
+    """
+    Yield groups from an open .jsonl file positioned after the header line.
+
+    Lines are decoded in ~batch_bytes chunks as one JSON array: the decoder
+    then shares key strings within the batch (per-line json.loads would
+    allocate every key again for every group) while memory stays bounded.
+    """
+    for batch in _line_batches(f, batch_bytes):
+        yield from _decode_batch(batch)
+
+
+def _line_batches(f, batch_bytes):
+    batch, size = [], 0
+    for line in f:
+        if not line.strip():
+            continue
+        batch.append(line)
+        size += len(line)
+        if size >= batch_bytes:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+
+def _decode_batch(batch):
+    if isinstance(batch[0], bytes):
+        return json.loads(b"[" + b",".join(batch) + b"]")
+    return json.loads("[" + ",".join(batch) + "]")
+
+
+def summarize_group(g: dict) -> dict:
+    """Group dict with only the fields the list/graph paths read."""
+    summary = {k: g[k] for k in SUMMARY_FIELDS if k in g}
+    summary["overview"] = {"neighbors": g.get("overview", {}).get("neighbors", [])}
+    return summary
+
+
+class GroupDetailStore:
+    """Full group records kept on disk, found through a byte-offset index over an mmap."""
+
+    def __init__(self, path: str, index: dict, offsets: array, lengths: array):
+        self.path = path
+        self._index = index  # gid -> row
+        self._offsets = offsets
+        self._lengths = lengths
+        # mmap tetap menunjuk file lama walau seeder me-rename file baru di atasnya
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, group_id: str):
+        row = self._index.get(group_id)
+        if row is None:
+            return None
+        return json.loads(self.read_raw(row))
+
+    def read_raw(self, row: int) -> bytes:
+        start = self._offsets[row]
+        return self._mm[start : start + self._lengths[row]]
+
+
+class MemoryDetailStore:
+    """Full group records kept in memory as compact JSON bytes (eager mode)."""
+
+    def __init__(self):
+        self._raw = {}
+
+    def __len__(self):
+        return len(self._raw)
+
+    def add(self, g: dict):
+        # Nested dict ~14 KB/group; JSON ringkas beberapa kali lebih kecil
+        self._raw[g["id"]] = json.dumps(g, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def get(self, group_id: str):
+        raw = self._raw.get(group_id)
+        return None if raw is None else json.loads(raw)
+
+
+def read_db_eager(path: str):
+    """
+    Load a DB fully into memory without keeping the nested dict tree.
+    Returns ({meta..., "groups": summaries}, GroupColumns, MemoryDetailStore).
+
+    .jsonl is streamed group by group; .json has to be parsed whole first.
+    """
+    columns, store = GroupColumns(), MemoryDetailStore()
+
+    def add(g):
+        columns.append(g)
+        store.add(g)
+
+    if is_jsonl(path):
+        with open(path, "r") as f:
+            header = _read_header(f)
+            for g in iter_jsonl_groups(f):
+                add(g)
+    else:
+        with open(path, "r") as f:
+            header = json.load(f)
+        for g in header.pop("groups", {}).values():
+            add(g)
+    columns.freeze()
+    return {**header, "groups": columns.summaries()}, columns, store
+
+
+def read_db_lazy(path: str, batch_bytes: int = JSONL_BATCH_BYTES):
+    """
+    Scan a .jsonl DB once.
+    Returns ({meta..., "groups": summaries}, GroupColumns, GroupDetailStore).
+    """
+    index = {}
+    offsets, lengths = array("Q"), array("I")
+    columns = GroupColumns()
+
+    def flush(batch, starts):
+        for line, start, g in zip(batch, starts, _decode_batch(batch)):
+            index[g["id"]] = len(offsets)
+            offsets.append(start)
+            lengths.append(len(line))
+            columns.append(g)
+
+    with open(path, "rb") as f:
+        header = _read_header(f)
+        pos = f.tell()
+        batch, starts, size = [], [], 0
+        for line in f:
+            start, pos = pos, pos + len(line)
+            if not line.strip():
+                continue
+            batch.append(line)
+            starts.append(start)
+            size += len(line)
+            if size >= batch_bytes:
+                flush(batch, starts)
+                batch, starts, size = [], [], 0
+        if batch:
+            flush(batch, starts)
+    columns.freeze()
+    data = {**header, "groups": columns.summaries()}
+    return data, columns, GroupDetailStore(path, index, offsets, lengths)
+
+
+def _read_header(f) -> dict:
+    line = f.readline()
+    header = json.loads(line) if line.strip() else {}
+    if "groups" in header:
+        raise ValueError("JSONL header must not contain 'groups'")
+    return header
+
+
+def write_db_jsonl(db: dict, path: str):
+    """Write `db` as JSON-lines via a temp file + rename (safe for the watcher)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        header = {k: v for k, v in db.items() if k != "groups"}
+        f.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for g in db.get("groups", {}).values():
+            f.write(json.dumps(g, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, path)
+
+
+def write_db_files(db: dict, json_path: str, jsonl_path: str, indent: int = 2):
+    """
+    Write both mock_db.json and mock_db.jsonl, each via a temp file, then
+    swap them in with back-to-back renames.
+
+    The JSONL temp file is written last, so it has the newer mtime. It is also
+    renamed first. The watcher (pick_db_path prefers the newest file, and
+    JSONL on ties) therefore switches straight to the complete new JSONL, and
+    the .json rename after it does not trigger a second reload.
+    """
+    json_tmp = f"{json_path}.tmp"
+    with open(json_tmp, "w") as f:
+        json.dump(db, f, indent=indent)
+    jsonl_tmp = f"{jsonl_path}.new"
+    write_db_jsonl(db, jsonl_tmp)
+    os.replace(jsonl_tmp, jsonl_path)
+    os.replace(json_tmp, json_path)
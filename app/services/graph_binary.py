@@ -0,0 +1,139 @@
+"""
+Format biner kolumnar untuk /api/v1/graph (?format=binary atau
+Accept: application/vnd.socialcollateral.graph).
+
+Layout (little-endian, semua buffer rata 8 byte supaya client bisa langsung
+membuat Int32Array/Int16Array tanpa copy):
+
+    "SCG1" | uint32 panjang header | header JSON (padding spasi) | buffer...
+
+Header berisi jumlah node/edge, tabel dictionary (warna, badge, kota, desa,
+relasi), nilai konstan edge, dan daftar buffer {name: {dtype, offset, length}}
+dengan offset relatif ke awal body. String unik per node (key, label) disimpan
+seperti kolom string Arrow: satu blob UTF-8 + offsets int32 (n + 1).
+
+Urutan node/edge sama persis dengan topologi JSON; key edge tidak dikirim
+karena bisa diturunkan: edge_{min(src,dst)}_{max(src,dst)} dari key node.
+"""
+import hashlib
+import struct
+
+import numpy as np
+import orjson
+
+from app.services.communities import get_communities
+from app.services.compression import PrecompressedBody
+from app.services.graph_index import get_edge_table
+from app.services.graph_service import node_colors
+
+GRAPH_BINARY_MEDIA_TYPE = "application/vnd.socialcollateral.graph"
+MAGIC = b"SCG1"
+FORMAT_VERSION = 1
+# Atribut edge yang sama di semua edge /graph JSON
+EDGE_DEFAULTS = {"size": 2, "color": "#cbd5e1", "type": "line"}
+
+
+class BinaryGraphPayload:
+    __slots__ = ("version", "body", "etag", "compressed")
+
+    def __init__(self, version: int, body: bytes):
+        self.version = version
+        self.body = body
+        self.etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self.compressed = PrecompressedBody(body)
+
+
+def get_binary_topology(snapshot) -> BinaryGraphPayload:
+    return snapshot.derived("graph_binary", lambda s: BinaryGraphPayload(s.version, encode_graph(s)))
+
+
+def encode_graph(snapshot) -> bytes:
+    """Columnar encoding of the full /graph topology of `snapshot`."""
+    comm = get_communities(snapshot)
+    cols = snapshot.columns
+    edges = get_edge_table(snapshot)
+    key_offsets, key_blob = _string_column(cols.ids)
+    label_offsets, label_blob = _string_column(["" if n is None else n for n in cols.names])
+    buffers = {
+        "x": cols.x.astype("<i4"),
+        "y": cols.y.astype("<i4"),
+        "size": cols.size.astype("<i2"),
+        "trust_score": cols.trust_score.astype("<i2"),
+        "color": cols.type_code.astype("<i2"),
+        "risk_badge": cols.badge_code.astype("<i2"),
+        "location_city": cols.city_id.astype("<i4"),
+        "location_village": cols.village_id.astype("<i4"),
+        "community": comm.community.astype("<i4"),
+        "component": comm.component.astype("<i4"),
+        "key_offsets": key_offsets,
+        "key_utf8": key_blob,
+        "label_offsets": label_offsets,
+        "label_utf8": label_blob,
+        "edge_source": edges.src.astype("<i4"),
+        "edge_target": edges.dst.astype("<i4"),
+        "edge_label": edges.rel.astype("<i2"),
+    }
+    header = {
+        "version": FORMAT_VERSION,
+        "node_count": len(cols),
+        "edge_count": len(edges),
+        "dictionaries": {
+            "color": node_colors(cols),
+            "risk_badge": cols.badges.values,
+            "location_city": cols.cities.values,
+            "location_village": cols.villages.values,
+            "edge_label": cols.relations.values,
+        },
+        "edge_defaults": EDGE_DEFAULTS,
+        "buffers": {},
+    }
+
+    # Offset buffer bergantung panjang header (dan sebaliknya): ulang sampai stabil
+    relative, pos = {}, 0
+    for name, arr in buffers.items():
+        relative[name] = pos
+        header["buffers"][name] = {"dtype": arr.dtype.str.lstrip("<|"), "offset": 0, "length": len(arr)}
+        pos = _align(pos + arr.nbytes)
+    start = 0
+    while True:
+        for name, spec in header["buffers"].items():
+            spec["offset"] = start + relative[name]
+        head = orjson.dumps(header)
+        needed = _align(len(MAGIC) + 4 + len(head))
+        if needed <= start:
+            break
+        start = needed
+    head += b" " * (start - len(MAGIC) - 4 - len(head))
+
+    out = bytearray(MAGIC + struct.pack("<I", len(head)) + head)
+    for arr in buffers.values():
+        out += arr.tobytes()
+        out += b"\0" * (_align(len(out)) - len(out))
+    return bytes(out)
+
+
+def decode_graph(body: bytes) -> dict:
+    """Reference decoder: header dict + NumPy views of every buffer (and decoded key/label lists)."""
+    if body[:4] != MAGIC:
+        raise ValueError("Not a SCG1 graph body")
+    (head_len,) = struct.unpack_from("<I", body, 4)
+    header = orjson.loads(body[8 : 8 + head_len])
+    arrays = {
+        name: np.frombuffer(body, dtype="<" + spec["dtype"], count=spec["length"], offset=spec["offset"])
+        for name, spec in header["buffers"].items()
+    }
+    for col in ("key", "label"):
+        offsets, blob = arrays[f"{col}_offsets"], arrays[f"{col}_utf8"].tobytes()
+        arrays[col] = [blob[a:b].decode("utf-8") for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+    return {"header": header, "arrays": arrays}
+
+
+def _string_column(values):
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i4")
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype="u1")
+
+
+def _align(n: int, to: int = 8) -> int:
+    return (n + to - 1) // to * to
@@ -0,0 +1,193 @@
+"""
+Per-snapshot graph indexes on top of the column store.
+
+- EdgeTable        : edge undirected kanonik (urutan sama dengan /graph) +
+                     adjacency CSR dua arah (row -> neighbor rows, edge ids)
+- SecondaryIndexes : type/badge/city/village -> rows, trust_score terurut
+- SpatialGrid      : grid uniform 2^level x 2^level di atas koordinat canvas
+                     (x, y); dipakai untuk tile/viewport query
+"""
+import numpy as np
+
+
+class EdgeTable:
+    """
+    Unique undirected edges in first-seen order (same order as the /graph
+    edge list). For duplicates (A->B and B->A) the last occurrence supplies
+    source/target/label, like the old dict-based dedupe.
+    """
+
+    def __init__(self, columns):
+        nbr_ptr, nbr_row, nbr_rel = columns.nbr_ptr.tolist(), columns.nbr_row.tolist(), columns.nbr_rel.tolist()
+        edge_of = {}
+        src, dst, rel = [], [], []
+        for r in range(len(columns)):
+            for k in range(nbr_ptr[r], nbr_ptr[r + 1]):
+                t = nbr_row[k]
+                if t < 0:
+                    continue
+                pair = (r, t) if r <= t else (t, r)
+                e = edge_of.get(pair)
+                if e is None:
+                    edge_of[pair] = len(src)
+                    src.append(r)
+                    dst.append(t)
+                    rel.append(nbr_rel[k])
+                else:
+                    src[e], dst[e], rel[e] = r, t, nbr_rel[k]
+
+        self.src = np.asarray(src, dtype=np.int32)
+        self.dst = np.asarray(dst, dtype=np.int32)
+        self.rel = np.asarray(rel, dtype=np.int16)
+        self._build_adjacency(len(columns))
+
+    def __len__(self):
+        return len(self.src)
+
+    def _build_adjacency(self, n):
+        # Tiap edge masuk ke list kedua ujungnya (self-loop cukup sekali)
+        loops = self.src == self.dst
+        ends = np.concatenate([self.src, self.dst[~loops]])
+        others = np.concatenate([self.dst, self.src[~loops]])
+        edge_ids = np.concatenate([np.arange(len(self.src)), np.flatnonzero(~loops)]).astype(np.int32)
+        order = np.argsort(ends, kind="stable")
+        self.adj_ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ends, minlength=n), out=self.adj_ptr[1:])
+        self.adj_row = others[order].astype(np.int32)
+        self.adj_edge = edge_ids[order]
+
+    def degree(self):
+        return np.diff(self.adj_ptr)
+
+
+class SecondaryIndexes:
+    """Category -> sorted rows, plus rows ordered by trust_score for range queries."""
+
+    def __init__(self, columns):
+        self.n = len(columns)
+        self.by_type = _group_rows(columns.type_code)
+        self.by_badge = _group_rows(columns.badge_code)
+        self.by_city = _group_rows(columns.city_id)
+        self.by_village = _group_rows(columns.village_id)
+        self.trust_order = np.argsort(columns.trust_score, kind="stable").astype(np.int32)
+        self.trust_sorted = columns.trust_score[self.trust_order]
+
+    def rows_with(self, index: dict, codes):
+        """Rows whose code is in `codes` (unknown codes simply match nothing)."""
+        parts = [index[c] for c in codes if c is not None and c in index]
+        if not parts:
+            return np.empty(0, dtype=np.int32)
+        return np.concatenate(parts)
+
+    def rows_in_trust_range(self, lo=None, hi=None):
+        start = 0 if lo is None else np.searchsorted(self.trust_sorted, lo, side="left")
+        end = len(self.trust_sorted) if hi is None else np.searchsorted(self.trust_sorted, hi, side="right")
+        return self.trust_order[start:end]
+
+
+class SpatialGrid:
+    """
+    Uniform grid over the node canvas. The world is the square bounding box
+    of all (x, y); at zoom z it splits into 2^z x 2^z tiles, and the index
+    itself buckets rows into 2^level x 2^level cells stored as CSR (cells
+    ordered row-major), so any tile/rect is a handful of contiguous slices.
+    """
+
+    def __init__(self, columns, level: int = None):
+        n = len(columns)
+        self.xs = columns.x.astype(np.float64)
+        self.ys = columns.y.astype(np.float64)
+        if n:
+            self.x0, self.y0 = float(self.xs.min()), float(self.ys.min())
+            extent = max(float(self.xs.max()) - self.x0, float(self.ys.max()) - self.y0)
+        else:
+            self.x0 = self.y0 = extent = 0.0
+        # Sedikit dilebarkan supaya titik di tepi max tetap jatuh di cell terakhir
+        self.extent = max(extent, 1.0) * (1 + 1e-9)
+        if level is None:
+            # ~8 node per cell, dibatasi 1024 x 1024 cell
+            level = int(np.clip(np.ceil(np.log2(max(np.sqrt(n / 8), 1))), 0, 10))
+        self.level = level
+
+        side = 1 << level
+        cx, cy = self.cell_coords(np.arange(n), level)
+        cells = cy * side + cx
+        self.cell_rows = np.argsort(cells, kind="stable").astype(np.int32)
+        self.cell_ptr = np.zeros(side * side + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=side * side), out=self.cell_ptr[1:])
+
+    def cell_coords(self, rows: np.ndarray, level: int):
+        """Integer (cx, cy) of `rows` on the 2^level grid."""
+        scale = (1 << level) / self.extent
+        cx = ((self.xs[rows] - self.x0) * scale).astype(np.int64)
+        cy = ((self.ys[rows] - self.y0) * scale).astype(np.int64)
+        return cx, cy
+
+    def tile_bounds(self, z: int, tx: int, ty: int):
+        w = self.extent / (1 << z)
+        return self.x0 + tx * w, self.y0 + ty * w, self.x0 + (tx + 1) * w, self.y0 + (ty + 1) * w
+
+    def rows_in_tile(self, z: int, tx: int, ty: int) -> np.ndarray:
+        """Rows whose point falls in tile (z, tx, ty), sorted by row."""
+        if z <= self.level:
+            span = 1 << (self.level - z)
+            cx0, cy0 = tx * span, ty * span
+            rows = self._cells_block(cx0, cy0, cx0 + span - 1, cy0 + span - 1)
+        else:
+            # Tile lebih kecil dari cell: ambil cell induknya lalu filter persis
+            shift = z - self.level
+            rows = self._cells_block(tx >> shift, ty >> shift, tx >> shift, ty >> shift)
+            cx, cy = self.cell_coords(rows, z)
+            rows = rows[(cx == tx) & (cy == ty)]
+        return np.sort(rows)
+
+    def rows_in_rect(self, x0, y0, x1, y1) -> np.ndarray:
+        """Rows with x0 <= x <= x1 and y0 <= y <= y1, sorted by row."""
+        scale = (1 << self.level) / self.extent
+        last = (1 << self.level) - 1
+        cx0, cy0 = (int(np.clip((v - o) * scale, 0, last)) for v, o in ((x0, self.x0), (y0, self.y0)))
+        cx1, cy1 = (int(np.clip((v - o) * scale, 0, last)) for v, o in ((x1, self.x0), (y1, self.y0)))
+        rows = self._cells_block(cx0, cy0, cx1, cy1)
+        xs, ys = self.xs[rows], self.ys[rows]
+        return np.sort(rows[(xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1)])
+
+    def _cells_block(self, cx0, cy0, cx1, cy1) -> np.ndarray:
+        side = 1 << self.level
+        if cx0 >= side or cy0 >= side or cx1 < 0 or cy1 < 0:
+            return np.empty(0, dtype=np.int32)
+        cx0, cy0, cx1, cy1 = max(cx0, 0), max(cy0, 0), min(cx1, side - 1), min(cy1, side - 1)
+        # Satu slice kontigu per baris grid
+        parts = [
+            self.cell_rows[self.cell_ptr[cy * side + cx0] : self.cell_ptr[cy * side + cx1 + 1]]
+            for cy in range(cy0, cy1 + 1)
+        ]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+
+
+def csr_slots(ptr: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Flat positions ptr[r]..ptr[r+1]-1 for every r in `rows`, vectorized."""
+    starts = ptr[rows]
+    counts = ptr[rows + 1] - starts
+    if not len(counts):
+        return np.empty(0, dtype=np.int64)
+    shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return shift + np.arange(int(counts.sum()), dtype=np.int64)
+
+
+def _group_rows(codes: np.ndarray) -> dict:
+    order = np.argsort(codes, kind="stable").astype(np.int32)
+    values, starts = np.unique(codes[order], return_index=True)
+    bounds = list(starts[1:]) + [len(order)]
+    return {int(v): order[s:e] for v, s, e in zip(values, starts, bounds)}
+
+
+def get_edge_table(snapshot) -> EdgeTable:
+    return snapshot.derived("edge_table", lambda s: EdgeTable(s.columns))
+
+
+def get_secondary_indexes(snapshot) -> SecondaryIndexes:
+    return snapshot.derived("secondary_indexes", lambda s: SecondaryIndexes(s.columns))
+
+
+def get_spatial_grid(snapshot) -> SpatialGrid:
+    return snapshot.derived("spatial_grid", lambda s: SpatialGrid(s.columns))
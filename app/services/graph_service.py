@@ -0,0 +1,367 @@
+import hashlib
+import os
+
+import numpy as np
+import orjson
+
+from app.services.communities import get_communities
+from app.services.compression import PrecompressedBody
+from app.services.data_service import data_service
+from app.services.graph_index import (
+    EdgeTable,
+    csr_slots,
+    get_edge_table,
+    get_secondary_indexes,
+    get_spatial_grid,
+)
+from app.services.lru import LRUCache
+
+NODE_COLORS = {
+    "toxic": "#EF4444",  # Red (Danger)
+    "medium": "#F59E0B",  # Orange/Yellow (Medium Risk)
+}
+DEFAULT_NODE_COLOR = "#10B981"  # Green (Healthy)
+
+# Tile dengan node lebih banyak dari ini dikirim sebagai cluster (zoom rendah)
+TILE_MAX_NODES = int(os.getenv("TILE_MAX_NODES", "2000"))
+# Tile cluster dibagi 2^bits x 2^bits sub-cell; satu sub-cell = satu super-node
+TILE_CLUSTER_BITS = 4
+TILE_CACHE_SIZE = int(os.getenv("TILE_CACHE_SIZE", "1024"))
+# Ego-network /groups/{id}/neighborhood: batas hop, batas node (cut-off BFS), ukuran LRU
+EGO_MAX_HOPS = 4
+EGO_MAX_NODES = int(os.getenv("EGO_MAX_NODES", "5000"))
+EGO_CACHE_SIZE = int(os.getenv("EGO_CACHE_SIZE", "2048"))
+# Kompres payload graph penuh (gzip/br) saat reload, bukan di request pertama
+GRAPH_PRECOMPRESS = os.getenv("GRAPH_PRECOMPRESS", "1") == "1"
+
+
+class TopologyPayload:
+    """Graph topology for one data version: Python objects + serialized JSON body."""
+
+    __slots__ = ("version", "nodes", "edges", "body", "etag", "compressed")
+
+    def __init__(self, version: int, nodes: list, edges: list):
+        self.version = version
+        self.nodes = nodes
+        self.edges = edges
+        self.body = to_json_bytes({"nodes": nodes, "edges": edges})
+        # Content hash, so every worker process hands out the same ETag
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=16).hexdigest()}"'
+        self.compressed = PrecompressedBody(self.body)
+
+
+def to_json_bytes(payload) -> bytes:
+    """
+    Compact UTF-8 JSON via orjson. Same bytes as JSONResponse's stdlib output
+    for finite values; NaN/Infinity become `null` (stdlib writes `NaN`, which
+    is not valid JSON).
+    """
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def get_topology(snapshot) -> TopologyPayload:
+    """Cached topology for `snapshot`; built on first use, dropped on reload."""
+    return snapshot.derived("topology", _build_payload)
+
+
+# Topologi + index dibangun di thread reload, bukan di request pertama
+data_service.add_warmer(get_topology)
+data_service.add_warmer(get_secondary_indexes)
+data_service.add_warmer(get_spatial_grid)
+if GRAPH_PRECOMPRESS:
+    data_service.add_warmer(lambda snap: get_topology(snap).compressed.warm())
+
+
+def _build_payload(snapshot) -> TopologyPayload:
+    topo = build_graph_topology(snapshot.columns, get_edge_table(snapshot), get_communities(snapshot))
+    return TopologyPayload(snapshot.version, topo["nodes"], topo["edges"])
+
+
+def node_colors(columns) -> list:
+    """Color per type code."""
+    return [NODE_COLORS.get(t, DEFAULT_NODE_COLOR) for t in columns.types.values]
+
+
+def build_graph_topology(columns, edge_table=None, communities=None):
+    """
+    Nodes (one per row) + unique undirected edges for Sigma.js, from the column
+    store; community/component attributes only when `communities` is given.
+    """
+    if edge_table is None:
+        edge_table = EdgeTable(columns)
+    ids, names = columns.ids, columns.names
+    colors = node_colors(columns)
+    badges, cities, villages = columns.badges.values, columns.cities.values, columns.villages.values
+    relations = columns.relations.values
+
+    # tolist() sekali per kolom: int Python siap JSON, tanpa akses numpy per elemen
+    xs, ys, sizes = columns.x.tolist(), columns.y.tolist(), columns.size.tolist()
+    trust = columns.trust_score.tolist()
+    type_code, badge_code = columns.type_code.tolist(), columns.badge_code.tolist()
+    city_id, village_id = columns.city_id.tolist(), columns.village_id.tolist()
+    community = communities.community.tolist() if communities is not None else None
+    component = communities.component.tolist() if communities is not None else None
+
+    # Build Nodes (Grup)
+    nodes = [
+        {
+            "key": gid,
+            "attributes": {
+                "label": names[r],
+                "x": xs[r],
+                "y": ys[r],
+                "size": sizes[r],
+                "color": colors[type_code[r]],
+                "risk_badge": badges[badge_code[r]],  # filter FE
+                "location_city": cities[city_id[r]],
+                "location_village": villages[village_id[r]],
+                "trust_score": trust[r],
+            },
+        }
+        for r, gid in enumerate(ids)
+    ]
+    if community is not None:
+        for r, node in enumerate(nodes):
+            node["attributes"]["community"] = community[r]
+            node["attributes"]["component"] = component[r]
+
+    # Build Edges (Relasi); sudah unik & undirected di EdgeTable
+    edges = []
+    for s_row, t_row, rel in zip(edge_table.src.tolist(), edge_table.dst.tolist(), edge_table.rel.tolist()):
+        source, target = ids[s_row], ids[t_row]
+        # Sort ID biar A->B dan B->A dianggap sama (Undirected Edge)
+        edge_key = f"edge_{source}_{target}" if source <= target else f"edge_{target}_{source}"
+        edges.append(
+            {
+                "key": edge_key,
+                "source": source,
+                "target": target,
+                "attributes": {
+                    "size": 2,
+                    "color": "#cbd5e1",
+                    "type": "line",
+                    "label": relations[rel],  # Label di garis
+                },
+            }
+        )
+
+    return {"nodes": nodes, "edges": edges}
+
+
+def filter_rows(snapshot, risk=None, risk_badge=None, city=None, village=None, min_trust=None, max_trust=None, bbox=None):
+    """
+    Sorted row numbers matching every given filter (None = no constraint).
+    List filters match any of their values; bbox is (x0, y0, x1, y1) inclusive.
+    """
+    columns = snapshot.columns
+    idx = get_secondary_indexes(snapshot)
+    mask = np.ones(len(columns), dtype=bool)
+
+    def restrict(rows):
+        keep = np.zeros(len(columns), dtype=bool)
+        keep[rows] = True
+        mask[:] &= keep
+
+    if risk:
+        restrict(idx.rows_with(idx.by_type, [columns.types.lookup(v) for v in risk]))
+    if risk_badge:
+        restrict(idx.rows_with(idx.by_badge, [columns.badges.lookup(v) for v in risk_badge]))
+    if city:
+        restrict(idx.rows_with(idx.by_city, [columns.cities.lookup(v) for v in city]))
+    if village:
+        restrict(idx.rows_with(idx.by_village, [columns.villages.lookup(v) for v in village]))
+    if min_trust is not None or max_trust is not None:
+        restrict(idx.rows_in_trust_range(min_trust, max_trust))
+    if bbox is not None:
+        restrict(get_spatial_grid(snapshot).rows_in_rect(*bbox))
+    return np.flatnonzero(mask)
+
+
+def page_topology(snapshot, rows: np.ndarray, offset: int = 0, limit: int = None) -> dict:
+    """
+    Nodes rows[offset:offset+limit] plus the edges induced by `rows` whose
+    later endpoint (in `rows` order) falls on this page. Walking all pages
+    therefore yields every induced edge exactly once, after both its nodes.
+    """
+    topo = get_topology(snapshot)
+    edge_table = get_edge_table(snapshot)
+    end = len(rows) if limit is None else min(len(rows), offset + limit)
+    page = rows[offset:end]
+
+    # Posisi tiap row di hasil filter (-1 = tidak ikut)
+    pos = np.full(len(snapshot.columns), -1, dtype=np.int64)
+    pos[rows] = np.arange(len(rows))
+
+    adj_ptr = edge_table.adj_ptr
+    owner = np.repeat(page, adj_ptr[page + 1] - adj_ptr[page])
+    slots = csr_slots(adj_ptr, page)
+    other_pos = pos[edge_table.adj_row[slots]]
+    keep = (other_pos >= 0) & (other_pos <= pos[owner])
+    edge_ids = np.unique(edge_table.adj_edge[slots[keep]])
+
+    next_offset = end if end < len(rows) else None
+    return {
+        "nodes": [topo.nodes[r] for r in page.tolist()],
+        "edges": [topo.edges[e] for e in edge_ids.tolist()],
+        "total_nodes": int(len(rows)),
+        "next_offset": next_offset,
+    }
+
+
+def get_ego_body(snapshot, group_id: str, hops: int, min_trust: int = None):
+    """Serialized k-hop neighborhood, LRU-cached per snapshot; None if the group is unknown."""
+    row = snapshot.columns.row_of.get(group_id)
+    if row is None:
+        return None
+    cache = snapshot.derived("ego_cache", lambda s: LRUCache(EGO_CACHE_SIZE))
+    return cache.get_or_compute(
+        (row, hops, min_trust), lambda: to_json_bytes(ego_network(snapshot, row, hops, min_trust))
+    )
+
+
+def ego_network(snapshot, row: int, hops: int, min_trust: int = None, max_nodes: int = EGO_MAX_NODES) -> dict:
+    """
+    Induced subgraph of everything within `hops` of `row` (bounded BFS over the
+    adjacency CSR). Groups below `min_trust` are neither included nor expanded
+    (the center always is). The BFS stops once `max_nodes` are reached.
+    """
+    columns = snapshot.columns
+    topo = get_topology(snapshot)
+    edge_table = get_edge_table(snapshot)
+    dist = np.full(len(columns), -1, dtype=np.int16)
+    dist[row] = 0
+    allowed = columns.trust_score >= min_trust if min_trust is not None else None
+    frontier = np.array([row], dtype=np.int64)
+    found = [frontier]
+    count, truncated = 1, False
+
+    for hop in range(1, hops + 1):
+        nbrs = edge_table.adj_row[csr_slots(edge_table.adj_ptr, frontier)]
+        nbrs = np.unique(nbrs[dist[nbrs] < 0])
+        if allowed is not None:
+            nbrs = nbrs[allowed[nbrs]]
+        if not len(nbrs):
+            break
+        if count + len(nbrs) > max_nodes:
+            # Cut-off: ambil yang muat saja (urut row, deterministik), lalu berhenti
+            nbrs = nbrs[: max_nodes - count]
+            truncated = True
+        dist[nbrs] = hop
+        found.append(nbrs)
+        count += len(nbrs)
+        frontier = nbrs.astype(np.int64)
+        if truncated:
+            break
+
+    rows = np.concatenate(found)
+    slots = csr_slots(edge_table.adj_ptr, rows)
+    inside = dist[edge_table.adj_row[slots]] >= 0
+    edge_ids = np.unique(edge_table.adj_edge[slots[inside]])
+    ids = columns.ids
+    return {
+        "center": ids[row],
+        "hops": hops,
+        "truncated": truncated,
+        "distances": {ids[r]: int(dist[r]) for r in rows.tolist()},
+        "nodes": [topo.nodes[r] for r in rows.tolist()],
+        "edges": [topo.edges[e] for e in edge_ids.tolist()],
+    }
+
+
+def get_tile_body(snapshot, z: int, tx: int, ty: int) -> bytes:
+    """Serialized tile, LRU-cached per snapshot (pan/zoom re-requests the same tiles)."""
+    cache = snapshot.derived("tile_cache", lambda s: LRUCache(TILE_CACHE_SIZE))
+    return cache.get_or_compute((z, tx, ty), lambda: to_json_bytes(build_tile(snapshot, z, tx, ty)))
+
+
+def build_tile(snapshot, z: int, tx: int, ty: int) -> dict:
+    """
+    Nodes visible in tile (z, tx, ty) of the canvas. Small tiles return the
+    real nodes plus every edge touching them (clients merge adjacent tiles);
+    crowded tiles (low zoom) return cluster super-nodes instead.
+    """
+    grid = get_spatial_grid(snapshot)
+    rows = grid.rows_in_tile(z, tx, ty)
+    tile = {"z": z, "x": tx, "y": ty, "bounds": list(grid.tile_bounds(z, tx, ty)), "node_count": int(len(rows))}
+
+    if len(rows) > TILE_MAX_NODES:
+        return {"tile": tile, "clustered": True, **_cluster_tile(snapshot, grid, rows, z, tx, ty)}
+
+    topo = get_topology(snapshot)
+    edge_table = get_edge_table(snapshot)
+    edge_ids = np.unique(edge_table.adj_edge[csr_slots(edge_table.adj_ptr, rows)])
+    return {
+        "tile": tile,
+        "clustered": False,
+        "nodes": [topo.nodes[r] for r in rows.tolist()],
+        "edges": [topo.edges[e] for e in edge_ids.tolist()],
+    }
+
+
+def _cluster_tile(snapshot, grid, rows, z, tx, ty) -> dict:
+    columns = snapshot.columns
+    edge_table = get_edge_table(snapshot)
+    level = z + TILE_CLUSTER_BITS
+    sub = 1 << TILE_CLUSTER_BITS
+
+    # Sub-cell global (stabil antar tile di zoom yang sama) -> index cluster lokal
+    cx, cy = grid.cell_coords(rows, level)
+    cell_ids, inverse, counts = np.unique(cy * (sub << z) + cx, return_inverse=True, return_counts=True)
+    k = len(cell_ids)
+    keys = [f"cluster_{level}_{c % (sub << z)}_{c // (sub << z)}" for c in cell_ids.tolist()]
+
+    sum_x = np.bincount(inverse, weights=grid.xs[rows], minlength=k)
+    sum_y = np.bincount(inverse, weights=grid.ys[rows], minlength=k)
+    sum_trust = np.bincount(inverse, weights=columns.trust_score[rows], minlength=k)
+    sum_loan = np.bincount(inverse, weights=columns.total_loan_amount[rows], minlength=k)
+    n_types = len(columns.types)
+    mix = np.bincount(inverse * n_types + columns.type_code[rows], minlength=k * n_types).reshape(k, n_types)
+    colors = node_colors(columns)
+
+    nodes = []
+    for i in range(k):
+        count = int(counts[i])
+        nodes.append(
+            {
+                "key": keys[i],
+                "attributes": {
+                    "label": f"{count} kelompok",
+                    "x": round(float(sum_x[i] / count), 2),
+                    "y": round(float(sum_y[i] / count), 2),
+                    "size": int(min(50, 10 + 4 * np.log2(count))),
+                    "color": colors[int(mix[i].argmax())],
+                    "cluster": True,
+                    "count": count,
+                    "trust_score": round(float(sum_trust[i] / count), 1),
+                    "total_loan_amount": int(sum_loan[i]),
+                    "risk_mix": {t: int(mix[i, code]) for code, t in enumerate(columns.types.values) if mix[i, code]},
+                },
+            }
+        )
+
+    # Super-edge antar cluster di tile ini, bobot = jumlah edge asli
+    cluster_of = np.full(len(columns), -1, dtype=np.int64)
+    cluster_of[rows] = inverse
+    edge_ids = np.unique(edge_table.adj_edge[csr_slots(edge_table.adj_ptr, rows)])
+    a, b = cluster_of[edge_table.src[edge_ids]], cluster_of[edge_table.dst[edge_ids]]
+    inside = (a >= 0) & (b >= 0) & (a != b)
+    lo, hi = np.minimum(a[inside], b[inside]), np.maximum(a[inside], b[inside])
+    pairs, weights = np.unique(lo * k + hi, return_counts=True)
+
+    edges = []
+    for pair, weight in zip(pairs.tolist(), weights.tolist()):
+        source, target = keys[pair // k], keys[pair % k]
+        edges.append(
+            {
+                "key": f"edge_{source}_{target}",
+                "source": source,
+                "target": target,
+                "attributes": {
+                    "size": int(min(10, 1 + np.log2(weight))),
+                    "color": "#cbd5e1",
+                    "type": "line",
+                    "weight": weight,
+                },
+            }
+        )
+    return {"nodes": nodes, "edges": edges}
@@ -0,0 +1,108 @@
+import os
+from typing import get_args
+
+import orjson
+from pydantic import BaseModel, ValidationError
+
+from app.models.schemas import GroupDetail
+from app.services.data_service import data_service
+from app.services.lru import LRUCache
+
+# Jumlah detail group (JSON bytes) yang di-cache per snapshot
+GROUP_DETAIL_CACHE_SIZE = int(os.getenv("GROUP_DETAIL_CACHE_SIZE", "4096"))
+
+
+class GroupDetailCache:
+    """
+    GroupDetail-validated, pre-serialized JSON bodies for one snapshot.
+
+    Groups are validated on first read and the bodies of recent ones are kept
+    in a bounded LRU, so the cache never holds a second copy of every group.
+    """
+
+    def __init__(self, snapshot, capacity: int = GROUP_DETAIL_CACHE_SIZE):
+        self._snapshot = snapshot
+        self._lru = LRUCache(capacity)
+
+    def get(self, group_id: str):
+        """JSON bytes for the group, or None if it is missing or fails validation."""
+        return self._lru.get_or_compute(group_id, lambda: self._load(group_id))
+
+    def _load(self, group_id):
+        snap = self._snapshot
+        data = snap.detail_store.get(group_id) if snap.detail_store is not None else snap.groups.get(group_id)
+        return _serialize(data) if data else None
+
+
+def get_detail_cache(snapshot) -> GroupDetailCache:
+    return snapshot.derived("group_detail_json", GroupDetailCache)
+
+
+data_service.add_warmer(get_detail_cache)
+
+
+def parse_fields(fields) -> dict:
+    """
+    "header,trends.repayment_history" (or a list of paths) -> projection tree
+    {"header": True, "trends": {"repayment_history": True}}. Paths are checked
+    against GroupDetail as far as the schema is typed; ValueError if unknown.
+    """
+    paths = fields.split(",") if isinstance(fields, str) else list(fields)
+    tree = {}
+    for path in paths:
+        parts = [p.strip() for p in path.strip().split(".")]
+        if parts == [""]:
+            continue
+        if "" in parts:
+            raise ValueError(f"Invalid field path: {path!r}")
+        model, node = GroupDetail, tree
+        for i, part in enumerate(parts):
+            if model is not None:
+                if part not in model.model_fields:
+                    raise ValueError(f"Unknown field: {'.'.join(parts[: i + 1])}")
+                model = _model_of(model.model_fields[part].annotation)
+            if i == len(parts) - 1:
+                node[part] = True
+                break
+            child = node.setdefault(part, {})
+            if child is True:
+                break  # parent sudah diambil utuh
+            node = child
+    return tree
+
+
+def project(value, tree):
+    """Keep only the paths in `tree` (lists are projected per element), in source key order."""
+    if tree is True:
+        return value
+    if isinstance(value, dict):
+        return {k: project(v, tree[k]) for k, v in value.items() if k in tree}
+    if isinstance(value, list):
+        return [project(v, tree) for v in value]
+    return value
+
+
+def project_body(body: bytes, tree: dict) -> bytes:
+    """Projection of a cached GroupDetail JSON body (same encoding as the cache)."""
+    if not tree:
+        return body
+    return orjson.dumps(project(orjson.loads(body), tree))
+
+
+def _model_of(annotation):
+    """BaseModel behind an annotation (Neighbor for List[Neighbor]); None for Dict/Any/scalars."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        model = _model_of(arg)
+        if model is not None:
+            return model
+    return None
+
+
+def _serialize(group: dict):
+    try:
+        return GroupDetail.model_validate(group).model_dump_json().encode("utf-8")
+    except ValidationError as e:
+        print(f"Group {group.get('id')} failed GroupDetail validation: {e.error_count()} errors")
+        return None
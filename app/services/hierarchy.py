@@ -0,0 +1,239 @@
+"""
+Level-of-detail untuk graph zoom-out: kota -> desa, plus grid geo-cluster.
+
+Tiap level menggabungkan group jadi super-node (jumlah group, rata-rata trust,
+komposisi risiko, total pinjaman, centroid canvas) dan edge jadi super-edge berbobot jumlah relasi neighbor
+antar cluster. Geo-cluster tidak bersarang di desa: ukuran sel grid dipilih
+per snapshot supaya jumlah sel sekitar sqrt(jumlah group). Saat reload, hierarchy baru
+diturunkan dari hierarchy snapshot lama: hanya kontribusi group yang berubah
+(ditambah/dihapus/berubah field atau neighbor) yang dikurangi lalu ditambah.
+"""
+import math
+import os
+
+import numpy as np
+
+from app.services.data_service import data_service
+from app.services.graph_index import csr_slots, get_edge_table
+from app.services.graph_service import DEFAULT_NODE_COLOR, GRAPH_PRECOMPRESS, NODE_COLORS, TopologyPayload
+
+LOD_LEVELS = ("city", "village", "cluster")
+# Ukuran sel geo-cluster terkecil dalam derajat lat/lng (~1.1 km); sel digandakan
+# sampai grid di atas bounding box punya paling banyak ~sqrt(n) sel
+GEO_CLUSTER_DEG = float(os.getenv("GEO_CLUSTER_DEG", "0.01"))
+GEO_CLUSTER_MAX_DOUBLINGS = 20
+# Kalau lebih dari porsi ini yang berubah, build ulang penuh lebih murah
+FULL_REBUILD_RATIO = 0.5
+
+
+class _Agg:
+    __slots__ = ("count", "trust", "loan", "x", "y", "mix")
+
+    def __init__(self):
+        self.count = 0
+        self.trust = 0
+        self.loan = 0
+        self.x = 0
+        self.y = 0
+        self.mix = {}
+
+    def copy(self):
+        other = _Agg()
+        other.count, other.trust, other.loan, other.x, other.y = self.count, self.trust, self.loan, self.x, self.y
+        other.mix = dict(self.mix)
+        return other
+
+
+class _Rows:
+    """Plain-Python per-row fields of one snapshot, as used by the hierarchy."""
+
+    def __init__(self, snapshot):
+        cols = snapshot.columns
+        self.columns = cols
+        self.edge_table = get_edge_table(snapshot)
+        self.trust = cols.trust_score.tolist()
+        self.loan = cols.total_loan_amount.tolist()
+        self.x, self.y = cols.x.tolist(), cols.y.tolist()
+        self.type = [cols.types[c] for c in cols.type_code.tolist()]
+        cities = [cols.cities[c] for c in cols.city_id.tolist()]
+        villages = [cols.villages[c] for c in cols.village_id.tolist()]
+        # Skala sel ikut di key: kalau skala berubah, semua group dianggap berubah
+        scale = _cluster_scale(cols.lat, cols.lng, max(1, math.ceil(math.sqrt(len(cols)))))
+        cell = GEO_CLUSTER_DEG * 2**scale
+        cells = zip(_geo_cells(cols.lat, cell), _geo_cells(cols.lng, cell))
+        self.keys = {
+            "city": [f"city:{c}" for c in cities],
+            "village": [f"village:{c}/{v}" for c, v in zip(cities, villages)],
+            "cluster": [f"cluster:{scale}/{a}_{b}" for a, b in cells],
+        }
+        self.parents = {"village": self.keys["city"]}
+
+        # Fingerprint = semua yang mempengaruhi kontribusi group ke hierarchy
+        nbr_ptr, nbr_row, ids = cols.nbr_ptr.tolist(), cols.nbr_row.tolist(), cols.ids
+        self.fingerprints = {}
+        for r, gid in enumerate(ids):
+            targets = tuple(ids[t] for t in nbr_row[nbr_ptr[r] : nbr_ptr[r + 1]] if t >= 0)
+            keys = (self.keys["city"][r], self.keys["village"][r], self.keys["cluster"][r])
+            self.fingerprints[gid] = hash(
+                (keys, self.trust[r], self.loan[r], self.x[r], self.y[r], self.type[r], targets)
+            )
+
+
+class ClusterHierarchy:
+    def __init__(self, snapshot, previous: "ClusterHierarchy" = None):
+        self.rows = _Rows(snapshot)
+        self.nodes = {level: {} for level in LOD_LEVELS}
+        self.edges = {level: {} for level in LOD_LEVELS}
+        self.parent = {}
+        self.changed_groups = None  # None = full build
+
+        cols = self.rows.columns
+        dirty_old, dirty_new = self._diff(previous) if previous is not None else (None, None)
+        if dirty_new is None or len(dirty_old) + len(dirty_new) > FULL_REBUILD_RATIO * max(len(cols), 1):
+            self._apply(self.rows, np.arange(len(cols)), +1)
+            self._apply_edges(self.rows, np.arange(len(self.rows.edge_table)), +1)
+        else:
+            for level in LOD_LEVELS:
+                self.nodes[level] = {k: a.copy() for k, a in previous.nodes[level].items()}
+                self.edges[level] = dict(previous.edges[level])
+            self.parent = dict(previous.parent)
+            self._apply(previous.rows, dirty_old, -1)
+            self._apply_edges(previous.rows, _incident_edges(previous.rows.edge_table, dirty_old), -1)
+            self._apply(self.rows, dirty_new, +1)
+            self._apply_edges(self.rows, _incident_edges(self.rows.edge_table, dirty_new), +1)
+            self.changed_groups = len(set(previous.rows.columns.ids[r] for r in dirty_old) | set(cols.ids[r] for r in dirty_new))
+
+    def _diff(self, previous):
+        old_fp, new_fp = previous.rows.fingerprints, self.rows.fingerprints
+        old_row_of, new_row_of = previous.rows.columns.row_of, self.rows.columns.row_of
+        dirty_old = [old_row_of[g] for g, fp in old_fp.items() if new_fp.get(g) != fp]
+        dirty_new = [new_row_of[g] for g, fp in new_fp.items() if old_fp.get(g) != fp]
+        return np.asarray(dirty_old, dtype=np.int64), np.asarray(dirty_new, dtype=np.int64)
+
+    def _apply(self, rows: _Rows, which: np.ndarray, sign: int):
+        for r in which.tolist():
+            for level in LOD_LEVELS:
+                key = rows.keys[level][r]
+                agg = self.nodes[level].get(key)
+                if agg is None:
+                    agg = self.nodes[level][key] = _Agg()
+                    if level in rows.parents:
+                        self.parent[key] = rows.parents[level][r]
+                agg.count += sign
+                agg.trust += sign * rows.trust[r]
+                agg.loan += sign * rows.loan[r]
+                agg.x += sign * rows.x[r]
+                agg.y += sign * rows.y[r]
+                agg.mix[rows.type[r]] = agg.mix.get(rows.type[r], 0) + sign
+                if agg.count == 0:
+                    del self.nodes[level][key]
+                    self.parent.pop(key, None)
+
+    def _apply_edges(self, rows: _Rows, edge_ids: np.ndarray, sign: int):
+        src, dst = rows.edge_table.src[edge_ids].tolist(), rows.edge_table.dst[edge_ids].tolist()
+        for level in LOD_LEVELS:
+            keys, weights = rows.keys[level], self.edges[level]
+            for u, v in zip(src, dst):
+                a, b = keys[u], keys[v]
+                if a == b:
+                    continue
+                pair = (a, b) if a < b else (b, a)
+                w = weights.get(pair, 0) + sign
+                if w:
+                    weights[pair] = w
+                else:
+                    del weights[pair]
+
+    def topology(self, level: str) -> dict:
+        """Super-nodes + weighted super-edges for `level`, in /graph node/edge shape."""
+        nodes = []
+        for key, agg in sorted(self.nodes[level].items()):
+            # Urut nama supaya hasil (termasuk tie dominant) sama untuk build penuh/inkremental
+            mix = {t: c for t, c in sorted(agg.mix.items(), key=lambda tc: str(tc[0])) if c}
+            dominant = max(mix, key=mix.get) if mix else None
+            if level == "cluster":
+                label = f"{agg.count} kelompok"
+            else:
+                label = key.split(":", 1)[1].rsplit("/", 1)[-1]
+            # Hanya agregat cluster (sama dengan cluster tile); field per group ada di /groups
+            attributes = {
+                "label": label,
+                "x": round(agg.x / agg.count, 2),
+                "y": round(agg.y / agg.count, 2),
+                "size": int(min(50, 10 + 4 * math.log2(agg.count))),
+                "color": NODE_COLORS.get(dominant, DEFAULT_NODE_COLOR),
+                "count": agg.count,
+                "trust_score": round(agg.trust / agg.count, 1),
+                "total_loan_amount": int(agg.loan),
+                "risk_mix": mix,
+            }
+            if key in self.parent:
+                attributes["parent"] = self.parent[key]
+            nodes.append({"key": key, "attributes": attributes})
+
+        edges = []
+        for (a, b), weight in sorted(self.edges[level].items()):
+            edges.append(
+                {
+                    "key": f"edge_{a}_{b}",
+                    "source": a,
+                    "target": b,
+                    "attributes": {
+                        "size": int(min(10, 1 + math.log2(weight))),
+                        "color": "#cbd5e1",
+                        "type": "line",
+                        "weight": weight,
+                    },
+                }
+            )
+        return {"nodes": nodes, "edges": edges}
+
+
+def get_hierarchy(snapshot) -> ClusterHierarchy:
+    """Per-snapshot hierarchy, derived incrementally from the previous live one when possible."""
+
+    def build(snap):
+        prev = snap.previous.peek("lod_hierarchy") if snap.previous is not None else None
+        return ClusterHierarchy(snap, prev)
+
+    return snapshot.derived("lod_hierarchy", build)
+
+
+def get_lod_payload(snapshot, level: str) -> TopologyPayload:
+    def build(snap):
+        topo = get_hierarchy(snap).topology(level)
+        return TopologyPayload(snap.version, topo["nodes"], topo["edges"])
+
+    return snapshot.derived(f"lod_payload:{level}", build)
+
+
+# Dibangun saat reload (pakai hierarchy lama), bukan saat request pertama
+data_service.add_warmer(get_hierarchy)
+for _level in LOD_LEVELS:
+    data_service.add_warmer(lambda snap, level=_level: get_lod_payload(snap, level))
+    if GRAPH_PRECOMPRESS:
+        data_service.add_warmer(lambda snap, level=_level: get_lod_payload(snap, level).compressed.warm())
+
+
+def _incident_edges(edge_table, rows: np.ndarray) -> np.ndarray:
+    return np.unique(edge_table.adj_edge[csr_slots(edge_table.adj_ptr, rows)])
+
+
+def _cluster_scale(lat: np.ndarray, lng: np.ndarray, target: int) -> int:
+    """Smallest k such that a grid of GEO_CLUSTER_DEG * 2**k cells over the bbox has <= target cells."""
+    ok = ~(np.isnan(lat) | np.isnan(lng))
+    if not ok.any():
+        return 0
+    lat, lng = lat[ok], lng[ok]
+    for k in range(GEO_CLUSTER_MAX_DOUBLINGS):
+        cell = GEO_CLUSTER_DEG * 2**k
+        span_lat = np.floor(lat.max() / cell) - np.floor(lat.min() / cell) + 1
+        span_lng = np.floor(lng.max() / cell) - np.floor(lng.min() / cell) + 1
+        if span_lat * span_lng <= target:
+            return k
+    return GEO_CLUSTER_MAX_DOUBLINGS
+
+
+def _geo_cells(values: np.ndarray, cell: float) -> list:
+    cells = np.floor(values / cell)
+    return ["na" if math.isnan(c) else str(int(c)) for c in cells.tolist()]
@@ -0,0 +1,142 @@
+"""
+Index file gambar di data/images/** untuk endpoint /images/{filename}.
+
+Resolusi nama sama dengan versi lama (cari nama persis per folder, lalu stem
+dengan ekstensi umum), tapi dijawab dari index in-memory: tidak ada
+os.path.exists per request. Index di-scan ulang oleh watcher dan hanya
+diganti kalau ada file yang berubah.
+"""
+import asyncio
+import logging
+import os
+
+IMAGE_ROOT = os.getenv("IMAGE_ROOT", os.path.join("data", "images"))
+# Urutan prioritas folder (sama dengan urutan lama); subfolder lain menyusul urut nama
+IMAGE_PRIORITY_DIRS = ("", "home", "bisnis")
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".webp")
+IMAGE_WATCH_INTERVAL = float(os.getenv("IMAGE_WATCH_INTERVAL", "30"))
+IMAGE_CACHE_MAX_AGE = int(os.getenv("IMAGE_CACHE_MAX_AGE", "86400"))
+# Batas memo hasil resolve (termasuk miss) supaya nama acak tidak menumpuk
+RESOLVE_MEMO_SIZE = 10000
+
+
+class ImageEntry:
+    __slots__ = ("path", "stat", "etag")
+
+    def __init__(self, path: str, stat: os.stat_result):
+        self.path = path
+        self.stat = stat
+        self.etag = f'"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+class ImageIndex:
+    def __init__(self, root: str = IMAGE_ROOT):
+        self.root = root
+        self.entries = {}  # relpath -> ImageEntry
+        self.signature = ()
+        self._exact = {}  # filename -> ImageEntry (folder prioritas pertama)
+        self._stems = {}  # stem -> [(ext, ImageEntry)] urut folder lalu IMAGE_EXTS
+        self._memo = {}
+
+    @classmethod
+    def scan(cls, root: str = IMAGE_ROOT) -> "ImageIndex":
+        index = cls(root)
+        index.entries = _scan_files(root)
+        index.signature = tuple(sorted((rel, e.stat.st_mtime_ns, e.stat.st_size) for rel, e in index.entries.items()))
+        index._build()
+        return index
+
+    def _build(self):
+        by_dir = {}
+        for rel, entry in self.entries.items():
+            d, name = os.path.split(rel)
+            by_dir.setdefault(d, {})[name] = entry
+        extra = sorted(d for d in by_dir if d not in IMAGE_PRIORITY_DIRS)
+        for d in [*IMAGE_PRIORITY_DIRS, *extra]:
+            files = by_dir.get(d, {})
+            for name, entry in files.items():
+                self._exact.setdefault(name, entry)
+            for name in sorted(files, key=_ext_rank):
+                stem, ext = os.path.splitext(name)
+                if ext in IMAGE_EXTS:
+                    self._stems.setdefault(stem, []).append((ext, files[name]))
+
+    def resolve(self, filename: str):
+        """ImageEntry for a requested name, or None. Hits and misses are memoized."""
+        try:
+            return self._memo[filename]
+        except KeyError:
+            pass
+        entry = self._exact.get(filename)
+        if entry is None:
+            stem, ext = os.path.splitext(filename)
+            # Tanpa ekstensi: ambil kandidat pertama; dengan ekstensi: coba ekstensi lain
+            for cand_ext, cand in self._stems.get(stem, ()):
+                if not ext or cand_ext != ext.lower():
+                    entry = cand
+                    break
+        if len(self._memo) >= RESOLVE_MEMO_SIZE:
+            self._memo.clear()
+        self._memo[filename] = entry
+        return entry
+
+    def listing(self) -> dict:
+        """Folder -> filenames for /debug/images ("root" always present; empty subfolders omitted)."""
+        result = {"root": []}
+        for rel in sorted(self.entries):
+            d, name = os.path.split(rel)
+            result.setdefault(d or "root", []).append(name)
+        return result
+
+
+class ImageService:
+    def __init__(self, root: str = IMAGE_ROOT):
+        self.root = root
+        self.index = ImageIndex(root)
+
+    def refresh(self) -> bool:
+        """Rescan the image tree; swap the index only if any file changed."""
+        fresh = ImageIndex.scan(self.root)
+        if fresh.signature == self.index.signature and self.index.entries:
+            return False
+        self.index = fresh
+        logging.info("Image index: %d files under %s", len(fresh.entries), self.root)
+        return True
+
+    def resolve(self, filename: str):
+        return self.index.resolve(filename)
+
+    async def watch(self, interval: float = IMAGE_WATCH_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except OSError as e:
+                logging.warning("Image index refresh failed: %s", e)
+
+
+def _scan_files(root: str) -> dict:
+    entries = {}
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            it = os.scandir(os.path.join(root, rel_dir))
+        except FileNotFoundError:
+            continue
+        with it:
+            for de in it:
+                rel = os.path.join(rel_dir, de.name)
+                if de.is_dir():
+                    stack.append(rel)
+                elif de.is_file():
+                    entries[rel] = ImageEntry(de.path, de.stat())
+    return entries
+
+
+def _ext_rank(name: str):
+    ext = os.path.splitext(name)[1]
+    return IMAGE_EXTS.index(ext) if ext in IMAGE_EXTS else len(IMAGE_EXTS)
+
+
+image_service = ImageService()
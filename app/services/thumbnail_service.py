@@ -0,0 +1,195 @@
+"""
+Resize + konversi format gambar untuk /images/{filename}?w=&h=&q=.
+
+Render dilakukan di process pool (Pillow CPU-bound, tidak boleh memblok event
+loop). Hasilnya disimpan di cache disk dengan key (file, mtime, size, params,
+format) dan dievict LRU kalau total ukuran melewati THUMB_CACHE_MAX_BYTES.
+"""
+import asyncio
+import contextlib
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+THUMB_CACHE_DIR = os.getenv("THUMB_CACHE_DIR", os.path.join(tempfile.gettempdir(), "socialcollateral-thumbs"))
+THUMB_CACHE_MAX_BYTES = int(os.getenv("THUMB_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+THUMB_WORKERS = int(os.getenv("THUMB_WORKERS", str(min(4, os.cpu_count() or 1))))
+THUMB_MAX_DIM = 2048
+THUMB_DEFAULT_QUALITY = 80
+
+# format Pillow -> (ekstensi cache, media type)
+FORMATS = {
+    "AVIF": (".avif", "image/avif"),
+    "WEBP": (".webp", "image/webp"),
+    "JPEG": (".jpg", "image/jpeg"),
+    "PNG": (".png", "image/png"),
+}
+_SOURCE_FORMATS = {".jpg": "JPEG", ".jpeg": "JPEG", ".png": "PNG", ".webp": "WEBP"}
+
+
+def negotiate_format(accept: str, source_path: str) -> str:
+    """AVIF/WebP when the client accepts it (and Pillow can encode it), else the source format."""
+    accept = (accept or "").lower()
+    if "image/avif" in accept and _can_encode("avif"):
+        return "AVIF"
+    if "image/webp" in accept and _can_encode("webp"):
+        return "WEBP"
+    return _SOURCE_FORMATS.get(os.path.splitext(source_path)[1].lower(), "JPEG")
+
+
+class ThumbnailCache:
+    """On-disk LRU of rendered variants; recency survives restarts via file mtime."""
+
+    def __init__(self, root: str = THUMB_CACHE_DIR, max_bytes: int = THUMB_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._files = OrderedDict()  # name -> size, terlama di depan
+        self._total = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _load(self):
+        os.makedirs(self.root, exist_ok=True)
+        found = []
+        for de in os.scandir(self.root):
+            if de.is_file() and not de.name.startswith("."):
+                st = de.stat()
+                found.append((st.st_mtime_ns, de.name, st.st_size))
+        for _, name, size in sorted(found):
+            self._files[name] = size
+            self._total += size
+        self._loaded = True
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def get(self, name: str):
+        """Cached file path for `name` (and mark it recently used), or None."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if name not in self._files:
+                return None
+            self._files.move_to_end(name)
+        path = self.path(name)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._total -= self._files.pop(name, 0)
+            return None
+        return path
+
+    def add(self, name: str, size: int):
+        evicted = []
+        with self._lock:
+            self._total += size - self._files.pop(name, 0)
+            self._files[name] = size
+            while self._total > self.max_bytes and len(self._files) > 1:
+                old, old_size = self._files.popitem(last=False)
+                self._total -= old_size
+                evicted.append(old)
+        for old in evicted:
+            try:
+                os.remove(self.path(old))
+            except FileNotFoundError:
+                pass
+
+
+class ThumbnailService:
+    def __init__(self, cache: ThumbnailCache = None, workers: int = THUMB_WORKERS):
+        self.cache = cache or ThumbnailCache()
+        self.workers = workers
+        self._pool = None
+        self._inflight = {}
+
+    def variant_key(self, entry, w, h, q, fmt) -> str:
+        st = entry.stat
+        raw = f"{entry.path}|{st.st_mtime_ns}|{st.st_size}|{w}|{h}|{q}|{fmt}".encode()
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    async def render(self, entry, w, h, q, fmt) -> tuple:
+        """(path, media_type, key) of the resized variant, rendering it on a miss."""
+        key = self.variant_key(entry, w, h, q, fmt)
+        ext, media_type = FORMATS[fmt]
+        name = key + ext
+        path = await asyncio.to_thread(self.cache.get, name)
+        if path is None:
+            # Request identik yang datang bersamaan menunggu render yang sama
+            task = self._inflight.get(name)
+            if task is None:
+                task = self._inflight[name] = asyncio.ensure_future(self._render(entry.path, name, w, h, q, fmt))
+                task.add_done_callback(lambda _: self._inflight.pop(name, None))
+            path = await asyncio.shield(task)
+        return path, media_type, key
+
+    async def _render(self, src, name, w, h, q, fmt) -> str:
+        if self._pool is None:
+            # spawn: aman dipakai dari proses yang sudah punya thread (uvicorn/anyio)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        os.makedirs(self.cache.root, exist_ok=True)
+        dst = self.cache.path(name)
+        loop = asyncio.get_running_loop()
+        try:
+            size = await loop.run_in_executor(self._pool, render_variant, src, dst, w, h, q, fmt)
+        except BrokenProcessPool:
+            # Worker mati (OOM dsb): buang pool, request berikutnya membuat yang baru
+            self._pool = None
+            raise
+        await asyncio.to_thread(self.cache.add, name, size)
+        return dst
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def render_variant(src: str, dst: str, w, h, q: int, fmt: str) -> int:
+    """Worker-process side: fit `src` into w x h (never upscale), encode, write atomically."""
+    from PIL import Image, ImageOps
+
+    with Image.open(src) as img:
+        img = ImageOps.exif_transpose(img)
+        if w or h:
+            img.thumbnail((w or THUMB_MAX_DIM * 8, h or THUMB_MAX_DIM * 8), Image.Resampling.LANCZOS)
+        if fmt == "JPEG" and img.mode != "RGB":
+            img = img.convert("RGB")
+        elif img.mode not in ("RGB", "RGBA", "L", "LA"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+        # Nama diawali "." supaya file setengah jadi tidak ikut ter-index cache
+        tmp = os.path.join(os.path.dirname(dst), f".{os.path.basename(dst)}.{os.getpid()}.tmp")
+        options = {"optimize": True} if fmt == "PNG" else {"quality": q}
+        try:
+            img.save(tmp, format=fmt, **options)
+        except BaseException:
+            # Sumber rusak / disk penuh: jangan tinggalkan .tmp di luar budget cache
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+    os.replace(tmp, dst)
+    return os.path.getsize(dst)
+
+
+_encoders = {}
+
+
+def _can_encode(feature: str) -> bool:
+    if feature not in _encoders:
+        try:
+            from PIL import features
+
+            _encoders[feature] = bool(features.check(feature))
+        except ImportError:
+            logging.warning("Pillow not installed; image format negotiation disabled")
+            _encoders[feature] = False
+    return _encoders[feature]
+
+
+thumbnail_service = ThumbnailService()
@@ -0,0 +1,126 @@
+"""
+Cache hasil analisis AI seeder di SQLite, content-addressed: key = blake2b
+dari (nama model, teks prompt, generation config, digest gambar). Input yang
+tidak berubah antar run tidak dikirim ulang ke Gemini.
+
+Eviction LRU berdasarkan ukuran: total ukuran value dijaga <= AI_CACHE_MAX_BYTES,
+entry dengan last_used paling lama dibuang dulu.
+
+Usage (dari root repo):
+    from scripts.ai_cache import AICache
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+AI_CACHE_PATH = os.getenv("AI_CACHE_PATH", "data/ai_cache.sqlite")
+AI_CACHE_MAX_BYTES = int(os.getenv("AI_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+EVICT_LOW_WATER = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ai_results (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ai_results_last_used ON ai_results (last_used);
+"""
+
+_digests = {}
+
+
+def file_digest(path) -> str:
+    """blake2b of a file's bytes (memoized per path/mtime/size); "none" if missing."""
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return "none"
+    memo_key = (path, st.st_mtime_ns, st.st_size)
+    digest = _digests.get(memo_key)
+    if digest is None:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = _digests[memo_key] = h.hexdigest()
+    return digest
+
+
+def cache_key(model_name: str, prompt: str, config: dict, image_digest: str) -> str:
+    material = json.dumps([model_name, prompt, config, image_digest], sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(material.encode(), digest_size=20).hexdigest()
+
+
+class AICache:
+    def __init__(self, path: str = AI_CACHE_PATH, max_bytes: int = AI_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SCHEMA)
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM ai_results").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+
+    def get(self, key: str):
+        row = self.db.execute("SELECT value FROM ai_results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self.db:
+            self.db.execute("UPDATE ai_results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, value) -> None:
+        blob = json.dumps(value, ensure_ascii=False).encode()
+        now = time.time()
+        with self.db:
+            old = self.db.execute("SELECT size FROM ai_results WHERE key = ?", (key,)).fetchone()
+            self.db.execute(
+                "INSERT OR REPLACE INTO ai_results (key, value, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+        self.total_bytes += len(blob) - (old[0] if old else 0)
+        self.stored += 1
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop least recently used entries until the total size is under the low-water mark."""
+        # Turun sampai 90%, supaya put berikutnya tidak langsung evict lagi
+        target = self.max_bytes * EVICT_LOW_WATER
+        with self.db:
+            while self.total_bytes > target:
+                rows = self.db.execute("SELECT key, size FROM ai_results ORDER BY last_used LIMIT 256").fetchall()
+                if not rows:
+                    break
+                doomed = []
+                for key, size in rows:
+                    if self.total_bytes <= target:
+                        break
+                    doomed.append((key,))
+                    self.total_bytes -= size
+                self.db.executemany("DELETE FROM ai_results WHERE key = ?", doomed)
+                self.evicted += len(doomed)
+
+    def entries(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM ai_results").fetchone()[0]
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0.0
+        return (
+            f"{self.hits} hits, {self.misses} misses ({rate:.0f}% hit), {self.stored} stored, "
+            f"{self.evicted} evicted, {self.entries()} entries / {self.total_bytes / 1024:.0f} KB"
+        )
+
+    def close(self) -> None:
+        self.db.close()
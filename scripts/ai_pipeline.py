@@ -0,0 +1,271 @@
+"""
+Stage AI seeder (asyncio): semua panggilan Gemini lewat satu pipeline.
+
+- RateLimiter         : token bucket bersama, request/menit (AI_RPM) dan
+                        token/menit (AI_TPM, estimasi input + output)
+- AdaptiveConcurrency : batas request in-flight (AIMD): naik +1 tiap `limit`
+                        sukses, dipotong setengah saat 429 (sekali per
+                        cooldown), selalu 1..AI_MAX_CONCURRENCY. Potongan
+                        yang sama ikut menurunkan laju RPM limiter; laju
+                        naik lagi pelan (RATE_STEP x AI_RPM per sukses)
+- Retry 429           : backoff eksponensial dengan full jitter, menunggu di
+                        luar slot sehingga request lain tetap jalan
+
+Error non-quota langsung gagal (hasil None, seeder memakai mockup).
+
+Usage (dari root repo):
+    from scripts.ai_pipeline import AIPipeline
+"""
+import asyncio
+import os
+import random
+import time
+from collections import Counter
+
+# Default 60 = aman untuk kuota Gemini default, tapi membatasi seeder ~60 group/menit;
+# set ke kuota project (mis. 600) kalau lebih besar
+AI_RPM = float(os.getenv("AI_RPM", "60"))
+AI_TPM = float(os.getenv("AI_TPM", "200000"))  # 0 = tanpa batas token
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "16"))
+AI_INITIAL_CONCURRENCY = int(os.getenv("AI_INITIAL_CONCURRENCY", "4"))
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "5"))
+AI_BACKOFF_BASE = float(os.getenv("AI_BACKOFF_BASE", "2"))
+AI_BACKOFF_CAP = float(os.getenv("AI_BACKOFF_CAP", "60"))
+# Isi bucket maksimum = jatah sekian detik (burst awal)
+BURST_SECONDS = 1
+# AIMD laju request: naik per sukses (porsi AI_RPM), batas bawah (porsi AI_RPM)
+RATE_STEP = 0.01
+RATE_FLOOR = 0.01
+
+THROTTLE_MARKERS = ("429", "resource exhausted", "quota", "rate limit")
+# Perkiraan token per gambar (Gemini menghitung gambar sebagai token tetap)
+IMAGE_TOKENS = 258
+# Perkiraan token output per jawaban (JSON analisis ~200 token, jauh di bawah max_output_tokens)
+AI_OUTPUT_TOKENS = int(os.getenv("AI_OUTPUT_TOKENS", "512"))
+
+
+def check_rates(rpm: float, tpm: float) -> None:
+    """Fail fast on limits that would stall or divide by zero in the token buckets."""
+    if not rpm > 0:
+        raise ValueError(f"AI_RPM must be > 0 (got {rpm:g})")
+    if tpm < 0:
+        raise ValueError(f"AI_TPM must be >= 0, 0 = unlimited (got {tpm:g})")
+
+
+# Dicek saat import: seeder langsung berhenti dengan pesan jelas, bukan ZeroDivisionError di stage AI
+check_rates(AI_RPM, AI_TPM)
+
+
+def is_throttle_error(exc: Exception) -> bool:
+    text = str(exc).lower()
+    return any(marker in text for marker in THROTTLE_MARKERS)
+
+
+def estimate_tokens(inputs, output_tokens: int = AI_OUTPUT_TOKENS) -> int:
+    """Rough token count: ~4 chars per token for text, fixed cost per image."""
+    total = output_tokens
+    for part in inputs:
+        total += len(part) // 4 if isinstance(part, str) else IMAGE_TOKENS
+    return total
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, burst_seconds: float = BURST_SECONDS):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        # Permintaan > kapasitas dipotong, supaya tidak menunggu selamanya
+        amount = min(amount, self.capacity)
+        # Lock = antrean FIFO: yang datang duluan dilayani duluan
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets shared by all calls."""
+
+    def __init__(self, rpm: float = AI_RPM, tpm: float = AI_TPM, burst_seconds: float = BURST_SECONDS):
+        check_rates(rpm, tpm)
+        self.requests = TokenBucket(rpm, burst_seconds)
+        self.tokens = TokenBucket(tpm, burst_seconds) if tpm > 0 else None
+        self.max_rate = self.requests.rate
+
+    async def acquire(self, tokens: float) -> None:
+        await self.requests.acquire(1)
+        if self.tokens is not None:
+            await self.tokens.acquire(tokens)
+
+    @property
+    def rpm(self) -> float:
+        return self.requests.rate * 60
+
+    def on_success(self) -> None:
+        self.requests.rate = min(self.max_rate, self.requests.rate + self.max_rate * RATE_STEP)
+
+    def on_throttle(self) -> None:
+        # Kuota server lebih kecil dari AI_RPM: turunkan laju, bucket dikosongkan
+        self.requests.rate = max(self.max_rate * RATE_FLOOR, self.requests.rate / 2)
+        self.requests.tokens = min(self.requests.tokens, 0.0)
+
+
+class AdaptiveConcurrency:
+    """Async context manager gating in-flight calls with an AIMD limit."""
+
+    def __init__(self, initial: int = AI_INITIAL_CONCURRENCY, maximum: int = AI_MAX_CONCURRENCY, cooldown: float = 1.0):
+        self.maximum = max(1, maximum)
+        self.limit = float(min(max(1, initial), self.maximum))
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_cut = float("-inf")
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def on_throttle(self) -> bool:
+        """Halve the limit; False when still cooling down from the previous cut."""
+        # 429 yang datang bersamaan (satu gelombang) cukup memotong sekali
+        now = time.monotonic()
+        if now - self._last_cut < self.cooldown:
+            return False
+        self.limit = max(1.0, self.limit / 2)
+        self._last_cut = now
+        return True
+
+
+class AIPipeline:
+    """Runs generate(inputs) for many jobs under shared rate/concurrency limits.
+
+    generate: async callable returning the parsed result (raise on failure).
+    prepare : async callable payload -> (inputs, estimated_tokens), run just
+              before a job is sent so prepared inputs stay bounded.
+    """
+
+    def __init__(
+        self,
+        generate,
+        prepare,
+        rpm: float = AI_RPM,
+        tpm: float = AI_TPM,
+        initial_concurrency: int = AI_INITIAL_CONCURRENCY,
+        max_concurrency: int = AI_MAX_CONCURRENCY,
+        max_retries: int = AI_MAX_RETRIES,
+        backoff_base: float = AI_BACKOFF_BASE,
+        backoff_cap: float = AI_BACKOFF_CAP,
+        burst_seconds: float = BURST_SECONDS,
+        throttle_cooldown: float = 1.0,
+        rng=random,
+    ):
+        check_rates(rpm, tpm)
+        self.generate = generate
+        self.prepare = prepare
+        self.rpm, self.tpm = rpm, tpm
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.burst_seconds = burst_seconds
+        self.throttle_cooldown = throttle_cooldown
+        self.rng = rng
+        self.stats = Counter()
+        self.elapsed = 0.0
+        self.limiter = None
+        self.gate = None
+
+    def backoff(self, attempt: int) -> float:
+        # Full jitter: worker yang kena 429 bersamaan tidak retry serempak
+        return self.rng.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+    async def call(self, key, inputs, tokens: float):
+        """Result of one job, or None after a non-quota error / exhausted retries."""
+        for attempt in range(self.max_retries):
+            async with self.gate:
+                await self.limiter.acquire(tokens)
+                self.stats["requests"] += 1
+                try:
+                    result = await self.generate(inputs)
+                except Exception as e:
+                    if not is_throttle_error(e):
+                        self.stats["failed"] += 1
+                        print(f"      ⚠️ {key} AI Error (non-quota): {e}")
+                        return None
+                    self.stats["throttled"] += 1
+                    if self.gate.on_throttle():
+                        self.limiter.on_throttle()
+                else:
+                    self.stats["ok"] += 1
+                    self.gate.on_success()
+                    self.limiter.on_success()
+                    return result
+            if attempt < self.max_retries - 1:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.backoff(attempt))
+        self.stats["failed"] += 1
+        print(f"      ⚠️ {key} AI failed after {self.max_retries} attempts (rate limited)")
+        return None
+
+    async def run(self, jobs, on_result=None) -> dict:
+        """{key: result or None} for an iterable of (key, payload).
+
+        on_result(key, result) is called as each job finishes (e.g. to persist it).
+        An exception from on_result is logged and counted per job; the result
+        stays in the returned dict and the other jobs keep running.
+        """
+        # Primitive asyncio dibuat di dalam event loop yang menjalankannya
+        self.limiter = RateLimiter(self.rpm, self.tpm, self.burst_seconds)
+        self.gate = AdaptiveConcurrency(self.initial_concurrency, self.max_concurrency, self.throttle_cooldown)
+        queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+        results = {}
+
+        async def worker():
+            while not queue.empty():
+                key, payload = queue.get_nowait()
+                inputs, tokens = await self.prepare(payload)
+                results[key] = await self.call(key, inputs, tokens)
+                if on_result is not None:
+                    try:
+                        on_result(key, results[key])
+                    except Exception as e:
+                        self.stats["callback_errors"] += 1
+                        print(f"      ⚠️ {key} on_result failed: {e!r}")
+
+        started = time.monotonic()
+        # Worker > batas in-flight: yang sedang backoff tidak membuat slot menganggur
+        await asyncio.gather(*(worker() for _ in range(2 * self.max_concurrency)))
+        self.elapsed = time.monotonic() - started
+        return results
+
+    def summary(self) -> str:
+        done = self.stats["ok"]
+        per_min = done / self.elapsed * 60 if self.elapsed else 0.0
+        return (
+            f"{done} ok, {self.stats['failed']} failed, {self.stats['requests']} requests, "
+            f"{self.stats['throttled']} throttled (429), {self.stats['retries']} retries, "
+            f"concurrency {self.gate.limit:.1f}, {self.limiter.rpm:.0f} RPM, {per_min:.0f} groups/min"
+            + (f", {self.stats['callback_errors']} on_result errors" if self.stats["callback_errors"] else "")
+        )
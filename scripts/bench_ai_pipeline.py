@@ -0,0 +1,96 @@
+"""
+Stage AI seeder: thread pool lama (MAX_WORKERS=4, backoff tetap 2/4s, 3
+percobaan) vs pipeline asyncio (ai_pipeline.py) terhadap model palsu
+(fake_model.py) dengan latency dan kuota 429.
+
+Waktu disimulasikan dipercepat (SCALE): semua latency, jendela kuota,
+backoff dan burst dikali SCALE; angka groups/min dilaporkan dalam menit
+simulasi.
+
+Usage (dari root repo):
+    python -m scripts.bench_ai_pipeline [n_groups]
+"""
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts.ai_pipeline import BURST_SECONDS, AIPipeline, estimate_tokens, is_throttle_error
+from scripts.fake_model import FakeGenerativeModel
+
+SCALE = 0.05
+LATENCY = (0.5, 1.5)
+LEGACY_WORKERS = 4
+# (nama, kuota server RPM, AI_RPM pipeline)
+SCENARIOS = (
+    ("latency-bound", 600, 600),
+    ("quota-bound", 60, 60),
+    ("quota unknown", 60, 600),
+)
+
+
+def make_model(quota_rpm):
+    return FakeGenerativeModel(rpm=quota_rpm, latency=tuple(x * SCALE for x in LATENCY), throttle_latency=0.05 * SCALE, window=60 * SCALE)
+
+
+def prompts(n):
+    return [f"ID: G{i + 1:03d}, DPD: {i % 40}, Biz: Warung, Loan: {i * 1000}" for i in range(n)]
+
+
+def legacy(model, jobs):
+    """Loop retry lama di process_single_group (sleep di thread worker)."""
+
+    def one(prompt):
+        for attempt in range(3):
+            try:
+                return json.loads(model.generate_content([prompt]).text)
+            except Exception as e:
+                if is_throttle_error(e) and attempt < 2:
+                    time.sleep(2 * (2**attempt) * SCALE)
+                elif not is_throttle_error(e):
+                    break
+        return None
+
+    with ThreadPoolExecutor(max_workers=LEGACY_WORKERS) as executor:
+        return list(executor.map(one, jobs))
+
+
+def pipelined(model, jobs, rpm):
+    async def generate(inputs):
+        return json.loads((await model.generate_content_async(inputs)).text)
+
+    async def prepare(prompt):
+        return [prompt], estimate_tokens([prompt])
+
+    # rpm dalam menit simulasi -> per menit nyata
+    pipeline = AIPipeline(
+        generate,
+        prepare,
+        rpm=rpm / SCALE,
+        tpm=0,
+        backoff_base=2 * SCALE,
+        backoff_cap=60 * SCALE,
+        burst_seconds=BURST_SECONDS * SCALE,
+        throttle_cooldown=1 * SCALE,
+    )
+    results = asyncio.run(pipeline.run(enumerate(jobs)))
+    return [results[i] for i in range(len(jobs))]
+
+
+def main(n):
+    jobs = prompts(n)
+    print(f"{n} groups, latency {LATENCY[0]}-{LATENCY[1]}s, time x{SCALE}")
+    print(f"{'scenario':<14} {'runner':<9} {'ok':>5} {'failed':>7} {'429':>6} {'sim time':>9} {'ok groups/min':>14}")
+    for name, quota, rpm in SCENARIOS:
+        for label, run in (("legacy", legacy), ("pipeline", lambda m, j: pipelined(m, j, rpm))):
+            model = make_model(quota)
+            t0 = time.perf_counter()
+            results = run(model, jobs)
+            sim = (time.perf_counter() - t0) / SCALE
+            ok = sum(r is not None for r in results)
+            print(f"{name:<14} {label:<9} {ok:>5} {n - ok:>7} {model.throttled:>6} {sim:>8.0f}s {ok / sim * 60:>14.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
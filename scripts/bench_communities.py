@@ -0,0 +1,44 @@
+"""
+Components (union-find) + label propagation (communities.py) per ukuran graf,
+untuk cek waktu tumbuh ~linear terhadap jumlah edge.
+
+Usage (dari root repo):
+    python -m scripts.bench_communities [n_groups ...]
+"""
+import sys
+import time
+
+import numpy as np
+
+from app.services.communities import Communities, connected_components, label_propagation
+from app.services.data_service import DataSnapshot
+from app.services.graph_index import get_edge_table
+from scripts.synthetic_db import make_db
+
+
+def main(sizes):
+    print(f"{'groups':>8} {'edges':>9} {'components':>11} {'lpa':>10} {'rounds':>6} {'total':>10} {'us/edge':>8}")
+    for n in sizes:
+        snap = DataSnapshot(make_db(n))
+        edges = get_edge_table(snap)
+
+        t0 = time.perf_counter()
+        connected_components(n, edges.src, edges.dst)
+        t_cc = time.perf_counter() - t0
+
+        slot_row = np.repeat(np.arange(n), edges.degree())
+        t0 = time.perf_counter()
+        _, rounds = label_propagation(n, slot_row, edges.adj_row, np.ones(len(slot_row)))
+        t_lpa = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        Communities(snap)
+        total = time.perf_counter() - t0
+        print(
+            f"{n:>8} {len(edges):>9} {t_cc * 1000:>8.1f} ms {t_lpa * 1000:>7.1f} ms {rounds:>6}"
+            f" {total * 1000:>7.1f} ms {total / max(len(edges), 1) * 1e6:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10000, 50000, 100000, 200000])
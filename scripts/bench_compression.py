@@ -0,0 +1,124 @@
+"""
+Bytes-on-wire + CPU server per request untuk response graph/group:
+identity vs gzip/br on-the-fly (middleware) vs precompressed (sekali per
+versi data), plus stdlib json vs orjson untuk serialisasi topologi.
+
+App dipanggil langsung lewat ASGI (tanpa HTTP client), jadi CPU yang diukur
+hanya sisi server. brotli opsional: tanpa modulnya cuma gzip yang diukur.
+
+Usage (dari root repo):
+    python -m scripts.bench_compression [n_groups] [n_requests]
+"""
+import asyncio
+import json
+import sys
+import time
+
+from fastapi import FastAPI, Response
+
+from app.api import graph as graph_api
+from app.api import groups as groups_api
+from app.api.middleware import CompressionMiddleware
+from app.api.responses import OrjsonResponse
+from app.services.compression import ENCODINGS
+from app.services.data_service import DataSnapshot, data_service
+from app.services.graph_service import get_topology, to_json_bytes
+from app.services.group_service import get_detail_cache
+from scripts.synthetic_db import make_db
+
+
+def build_app():
+    app = FastAPI(default_response_class=OrjsonResponse)
+    app.include_router(graph_api.router, prefix="/api/v1")
+    app.include_router(groups_api.router, prefix="/api/v1")
+
+    @app.get("/otf/graph")
+    async def graph_compressed_per_request():
+        # Body cache yang sama, tapi dikompres middleware di tiap request
+        return Response(content=get_topology(data_service.snapshot).body, media_type="application/json")
+
+    app.add_middleware(CompressionMiddleware)
+    return app
+
+
+async def asgi_get(app, path: str, accept_encoding: str) -> int:
+    """Run one GET through the ASGI app; returns body bytes sent."""
+    raw_path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": raw_path,
+        "raw_path": raw_path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"accept-encoding", accept_encoding.encode())],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    sent = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal sent
+        if message["type"] == "http.response.body":
+            sent += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return sent
+
+
+async def measure(app, path, accept_encoding, n_requests):
+    await asgi_get(app, path, accept_encoding)  # warmup (lazy precompress dsb)
+    c0, t0 = time.process_time(), time.perf_counter()
+    for _ in range(n_requests):
+        size = await asgi_get(app, path, accept_encoding)
+    cpu = (time.process_time() - c0) / n_requests
+    wall = (time.perf_counter() - t0) / n_requests
+    return size, cpu, wall
+
+
+async def main(n_groups, n_requests):
+    snap = DataSnapshot(make_db(n_groups))
+    data_service.snapshot = snap
+    topo = get_topology(snap)
+    get_detail_cache(snap)
+    payload = {"nodes": topo.nodes, "edges": topo.edges}
+
+    t0 = time.perf_counter()
+    old = json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    t1 = time.perf_counter()
+    new = to_json_bytes(payload)
+    t2 = time.perf_counter()
+    print(f"{n_groups} groups, {len(topo.edges)} edges | topology JSON {len(new) / 1e6:.1f} MB")
+    print(f"serialize: stdlib json {(t1 - t0) * 1000:.0f} ms | orjson {(t2 - t1) * 1000:.0f} ms | identical {old == new}")
+
+    t0 = time.perf_counter()
+    for encoding in ENCODINGS:
+        topo.compressed.encoded(encoding)
+    print(f"precompress {'+'.join(ENCODINGS)} once per data version: {(time.perf_counter() - t0) * 1000:.0f} ms\n")
+
+    app = build_app()
+    gid = next(iter(snap.groups))
+    cases = [
+        ("graph (cached)", "/api/v1/graph", "precompressed"),
+        ("graph (cached)", "/otf/graph", "per request"),
+        ("graph ?limit=500", "/api/v1/graph?limit=500", "per request"),
+        ("group detail", f"/api/v1/groups/{gid}", "per request"),
+    ]
+    print(f"{'endpoint':<18} {'encoding':<9} {'mode':<14} {'bytes':>11} {'cpu/req':>11} {'wall/req':>11}")
+    for label, path, mode in cases:
+        for encoding in ("identity", *ENCODINGS):
+            n = max(1, n_requests // 20) if mode == "per request" and label.startswith("graph (") else n_requests
+            size, cpu, wall = await measure(app, path, encoding, n)
+            shown = "-" if encoding == "identity" else mode
+            print(f"{label:<18} {encoding:<9} {shown:<14} {size:>11,} {cpu * 1000:>8.3f} ms {wall * 1000:>8.3f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    n_groups, n_requests = (args + [5000, 200][len(args):])[:2]
+    asyncio.run(main(n_groups, n_requests))
@@ -0,0 +1,58 @@
+"""
+Risk contagion (contagion.py): waktu precompute per versi data (ppr &
+diffusion) dan latency /api/v1/graph/contagion setelah precompute.
+
+Usage (dari root repo):
+    python -m scripts.bench_contagion [n_groups ...]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.api import graph as graph_api
+from app.services.contagion import CONTAGION_METHODS, ContagionScores, get_contagion
+from app.services.data_service import DataSnapshot, data_service
+from app.services.graph_index import get_edge_table
+from scripts.synthetic_db import make_db
+
+
+async def latency(client, path, n=50):
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        r = await client.get(path)
+        samples.append(time.perf_counter() - t0)
+        assert r.status_code == 200
+    return statistics.median(samples) * 1000, len(r.content)
+
+
+async def main(sizes):
+    app = FastAPI()
+    app.include_router(graph_api.router, prefix="/api/v1")
+    transport = httpx.ASGITransport(app=app)
+    for n in sizes:
+        snap = DataSnapshot(make_db(n))
+        t0 = time.perf_counter()
+        edges = get_edge_table(snap)
+        print(f"\n{n} groups, {len(edges)} edges (edge table {(time.perf_counter() - t0) * 1000:.0f} ms)")
+        for method in CONTAGION_METHODS:
+            t0 = time.perf_counter()
+            result = ContagionScores(snap, method)
+            total = time.perf_counter() - t0
+            print(f"  precompute {method:<9} {total * 1000:8.1f} ms ({result.iterations} iterations, incl. serialization)")
+            snap.derived(f"contagion:{method}", lambda s, r=result: r)
+
+        data_service.snapshot = snap
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for path in ("/api/v1/graph/contagion", "/api/v1/graph/contagion?top=100"):
+                p50, size = await latency(client, path)
+                print(f"  GET {path:<36} p50 {p50:7.2f} ms  ({size:,} bytes)")
+        assert get_contagion(snap) is snap.peek("contagion:ppr")
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(a) for a in sys.argv[1:]] or [10000, 100000]))
@@ -0,0 +1,172 @@
+"""
+Agregasi CSV seeder: cara lama (csv.DictReader -> list semua baris, dict
+mapping, loop per group) vs csv_ingest (streaming sekali, loan per chunk,
+bincount NumPy).
+
+Tiap pengukuran jalan di subprocess baru. Dilaporkan: waktu total dan peak
+memori Python (tracemalloc) untuk file loan_snapshots.csv dengan N baris.
+
+Usage (dari root repo):
+    python -m scripts.bench_csv_ingest [100000 1000000]
+"""
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+GROUP_SIZE = 15
+MAX_NODES = 100
+LOANS_PER_CUSTOMER = 10
+N_TASKS = 5000
+
+
+def make_csvs(root, n_loans, seed=0):
+    rng = random.Random(seed)
+    n_customers = max(1, n_loans // LOANS_PER_CUSTOMER)
+    purposes = ["Jahit", "Warung Sembako", "Ternak", "Kue Basah", "Bengkel"]
+    with open(os.path.join(root, "customers.csv"), "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["customer_number", "purpose"])
+        for i in range(n_customers):
+            w.writerow([f"C{i}", rng.choice(purposes)])
+    with open(os.path.join(root, "tasks.csv"), "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["task_id", "latitude", "longitude"])
+        for i in range(N_TASKS):
+            w.writerow([f"T{i}", rng.uniform(-6.7, -6.1), rng.uniform(106.6, 107.0)])
+    with open(os.path.join(root, "task_participants.csv"), "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["participant_id", "task_id"])
+        for i in range(0, n_loans, 3):
+            w.writerow([f"L{i}", f"T{rng.randrange(N_TASKS)}"])
+    with open(os.path.join(root, "loan_snapshots.csv"), "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["customer_number", "loan_id", "dpd", "outstanding_amount"])
+        for i in range(n_loans):
+            w.writerow([f"C{rng.randrange(n_customers)}", f"L{i}", rng.choice([0, 0, 0, 5, 40]), rng.randint(1, 50) * 100000])
+
+
+def legacy_summaries(raw_dir):
+    """Agregasi seeder sebelum csv_ingest (load_csv_safe + summarize_group)."""
+
+    def load_csv_safe(name):
+        path = os.path.join(raw_dir, name)
+        with open(path, mode="r", encoding="utf-8-sig") as f:
+            sample = f.readline()
+            delim = ";" if ";" in sample else ","
+            f.seek(0)
+            return list(csv.DictReader(f, delimiter=delim))
+
+    customers = load_csv_safe("customers.csv")
+    loans = load_csv_safe("loan_snapshots.csv")
+    tasks = load_csv_safe("tasks.csv")
+    participants = load_csv_safe("task_participants.csv")
+
+    cust_map = {}
+    for c in customers:
+        key = c.get("customer_number") or c.get("id")
+        if key:
+            cust_map[key.strip()] = c
+    cust_loans = {}
+    for l in loans:
+        key = l.get("customer_number")
+        if key:
+            cust_loans.setdefault(key.strip(), []).append(l)
+    task_loc = {t["task_id"]: {"lat": t["latitude"], "lng": t["longitude"]} for t in tasks if "task_id" in t}
+    loan_loc = {}
+    for p in participants:
+        pid, tid = p.get("participant_id"), p.get("task_id")
+        if pid and tid in task_loc:
+            loan_loc[pid] = task_loc[tid]
+
+    all_cust_ids = list(cust_map)
+    summaries = []
+    for i in range(0, len(all_cust_ids), GROUP_SIZE):
+        if len(summaries) >= MAX_NODES:
+            break
+        batch_ids = all_cust_ids[i : i + GROUP_SIZE]
+        total_dpd, total_loan, businesses, loc_candidates = 0, 0, [], []
+        for cid in batch_ids:
+            for l in cust_loans.get(cid, []):
+                try:
+                    total_dpd += int(float(l.get("dpd", 0)))
+                except:
+                    pass
+                try:
+                    total_loan += float(l.get("outstanding_amount", 0))
+                except:
+                    pass
+                if l.get("loan_id") in loan_loc:
+                    loc_candidates.append(loan_loc[l.get("loan_id")])
+            if cid in cust_map:
+                businesses.append(cust_map[cid].get("purpose", "Usaha Mikro"))
+        common_biz = max(sorted(set(businesses)), key=businesses.count) if businesses else "Pedagang Umum"
+        location = (float(loc_candidates[0]["lat"]), float(loc_candidates[0]["lng"])) if loc_candidates else None
+        summaries.append((batch_ids, total_dpd / len(batch_ids), total_loan, common_biz, location))
+    return summaries
+
+
+def _summaries(loader, raw_dir):
+    if loader == "legacy":
+        return legacy_summaries(raw_dir)
+    from scripts.csv_ingest import ingest
+
+    return [tuple(s) for s in ingest(raw_dir, GROUP_SIZE, MAX_NODES)]
+
+
+def _measure(mode, loader, raw_dir):
+    if mode == "py":
+        tracemalloc.start()
+        _summaries(loader, raw_dir)
+        result = {"peak": tracemalloc.get_traced_memory()[1]}
+    else:
+        t0 = time.perf_counter()
+        summaries = _summaries(loader, raw_dir)
+        result = {"t_total": time.perf_counter() - t0, "summaries": summaries}
+    print(json.dumps(result))
+
+
+def _run(loader, raw_dir):
+    result = {}
+    for mode in ("time", "py"):
+        out = subprocess.run(
+            [sys.executable, "-m", "scripts.bench_csv_ingest", "--measure", mode, loader, raw_dir],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result.update(json.loads(out.stdout.strip().splitlines()[-1]))
+    return result
+
+
+def bench(n_loans, tmpdir):
+    raw_dir = os.path.join(tmpdir, str(n_loans))
+    os.makedirs(raw_dir)
+    make_csvs(raw_dir, n_loans)
+    size_mb = os.path.getsize(os.path.join(raw_dir, "loan_snapshots.csv")) / 1e6
+    print(f"\n{n_loans:,} loan rows ({size_mb:.1f} MB loan_snapshots.csv)")
+    results = {}
+    for loader in ("legacy", "ingest"):
+        r = results[loader] = _run(loader, raw_dir)
+        print(f"  {loader:<7} total {r['t_total']:7.2f} s   peak {r['peak'] / 1e6:8.1f} MB")
+    same = results["legacy"]["summaries"] == results["ingest"]["summaries"]
+    print(f"  same summaries: {same}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--measure":
+        _measure(*sys.argv[2:5])
+        return
+    sizes = [int(a) for a in sys.argv[1:]] or [100000, 1000000]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n in sizes:
+            bench(n, tmpdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark loader DB: json.load (mock_db.json) vs streaming JSON-lines vs
+lazy JSONL (ringkasan di memori + offset index, detail dibaca dari disk).
+
+Tiap pengukuran jalan di subprocess baru supaya angka memori tidak saling
+mempengaruhi. Dilaporkan: waktu load total, waktu sampai group pertama
+tersedia, serta peak & resident memori Python (tracemalloc). Halaman mmap
+mode lazy adalah page cache, jadi tidak dihitung sebagai memori proses.
+
+Usage (dari root repo):
+    python -m scripts.bench_db_loader [100 10000 50000]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+def _load(loader, path):
+    from app.services.db_store import read_db, read_db_lazy
+
+    return read_db_lazy(path) if loader == "lazy" else read_db(path)
+
+
+def _measure(mode, loader, path):
+    from app.services.db_store import is_jsonl, iter_jsonl_groups
+
+    if mode == "first":
+        # Waktu sampai group pertama bisa dipakai
+        t0 = time.perf_counter()
+        if is_jsonl(path):
+            with open(path) as f:
+                f.readline()
+                next(iter_jsonl_groups(f))
+        else:
+            with open(path) as f:
+                next(iter(json.load(f)["groups"].values()))
+        result = {"t_first": time.perf_counter() - t0}
+    elif mode == "py":
+        tracemalloc.start()
+        # Hasil load tetap hidup saat diukur: "resident" = memori yang dipegang loader
+        db = _load(loader, path)
+        current, peak = tracemalloc.get_traced_memory()
+        data = db[0] if loader == "lazy" else db
+        result = {"peak": peak, "resident": current, "groups": len(data["groups"])}
+    else:
+        t0 = time.perf_counter()
+        _load(loader, path)
+        result = {"t_total": time.perf_counter() - t0}
+    print(json.dumps(result))
+
+
+def _run(loader, path):
+    result = {}
+    for mode in ("first", "py", "time"):
+        out = subprocess.run(
+            [sys.executable, "-m", "scripts.bench_db_loader", "--measure", mode, loader, path],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result.update(json.loads(out.stdout.strip().splitlines()[-1]))
+    return result
+
+
+def bench(n, tmpdir):
+    from app.services.db_store import write_db_jsonl
+    from scripts.synthetic_db import make_db
+
+    db = make_db(n)
+    json_path = os.path.join(tmpdir, f"db_{n}.json")
+    jsonl_path = os.path.join(tmpdir, f"db_{n}.jsonl")
+    with open(json_path, "w") as f:
+        json.dump(db, f, indent=2)  # sama seperti output seeder
+    write_db_jsonl(db, jsonl_path)
+    del db
+
+    size_mb = os.path.getsize(json_path) / 1e6
+    for label, loader, path in (
+        ("json.load", "eager", json_path),
+        ("jsonl stream", "eager", jsonl_path),
+        ("jsonl lazy", "lazy", jsonl_path),
+    ):
+        r = _run(loader, path)
+        assert r["groups"] == n, f"{label} loaded {r['groups']} of {n} groups"
+        print(
+            f"{n:>7} groups ({size_mb:7.1f} MB) | {label:<12} | total {r['t_total'] * 1000:8.1f} ms"
+            f" | first group {r['t_first'] * 1000:8.2f} ms | peak py {r['peak'] / 1e6:8.1f} MB"
+            f" | resident py {r['resident'] / 1e6:8.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        _measure(*sys.argv[2:5])
+        sys.exit(0)
+    sizes = [int(a) for a in sys.argv[1:]] or [100, 10000, 50000]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n in sizes:
+            bench(n, tmpdir)
@@ -0,0 +1,48 @@
+"""
+Topologi /graph: JSON vs format biner kolumnar (graph_binary.py).
+Ukuran (raw/gzip/br), waktu encode di server, dan waktu parse di client
+(json.loads vs decode_graph dengan NumPy sebagai pengganti typed array JS).
+
+Usage (dari root repo):
+    python -m scripts.bench_graph_binary [n_groups ...]
+"""
+import sys
+import time
+
+import orjson
+
+from app.services.compression import ENCODINGS, compress
+from app.services.data_service import DataSnapshot
+from app.services.graph_binary import decode_graph, encode_graph
+from app.services.graph_index import get_edge_table
+from app.services.graph_service import get_topology
+from scripts.synthetic_db import make_db
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return result, best
+
+
+def main(sizes):
+    header = f"{'groups':>8} {'format':<7} {'raw':>12}" + "".join(f" {e:>11}" for e in ENCODINGS)
+    print(header + f" {'encode':>10} {'parse':>10}")
+    for n in sizes:
+        snap = DataSnapshot(make_db(n))
+        get_edge_table(snap)
+        topo = get_topology(snap)
+        json_body, json_encode = timed(lambda: orjson.dumps({"nodes": topo.nodes, "edges": topo.edges}))
+        _, json_parse = timed(lambda: orjson.loads(json_body))
+        bin_body, bin_encode = timed(lambda: encode_graph(snap))
+        _, bin_parse = timed(lambda: decode_graph(bin_body))
+        for label, body, enc, parse in (("json", json_body, json_encode, json_parse), ("binary", bin_body, bin_encode, bin_parse)):
+            sizes_enc = "".join(f" {len(compress(body, e)):>11,}" for e in ENCODINGS)
+            print(f"{n:>8} {label:<7} {len(body):>12,}{sizes_enc} {enc * 1000:>7.1f} ms {parse * 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1000, 10000, 50000])
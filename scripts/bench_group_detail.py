@@ -0,0 +1,83 @@
+"""
+Load test /groups/{group_id}: validasi response_model per request (lama) vs
+JSON bytes yang divalidasi sekali per versi data saat pertama dibaca, lalu
+disimpan di LRU (baru).
+
+Request dikirim in-process lewat httpx.ASGITransport (butuh `pip install httpx`),
+jadi angka di bawah = biaya server tanpa jaringan.
+
+Usage (dari root repo):
+    python -m scripts.bench_group_detail [n_groups] [n_requests] [concurrency]
+"""
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from app.api import groups as groups_api
+from app.models.schemas import GroupDetail
+from app.services.data_service import DataSnapshot, data_service
+from app.services.group_service import get_detail_cache
+from scripts.synthetic_db import make_db
+
+
+def build_app():
+    app = FastAPI()
+    app.include_router(groups_api.router, prefix="/new")
+
+    @app.get("/old/groups/{group_id}", response_model=GroupDetail)
+    async def legacy_group_detail(group_id: str):
+        data = data_service.get_group_detail(group_id)
+        if not data:
+            raise HTTPException(status_code=404, detail="Group not found")
+        return data
+
+    return app
+
+
+async def run(client, prefix, gids, n_requests, concurrency):
+    latencies = []
+    queue = [random.choice(gids) for _ in range(n_requests)]
+
+    async def worker():
+        while queue:
+            gid = queue.pop()
+            t0 = time.perf_counter()
+            r = await client.get(f"{prefix}/groups/{gid}")
+            latencies.append(time.perf_counter() - t0)
+            assert r.status_code == 200
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - t0
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    return statistics.median(latencies), p99, n_requests / wall
+
+
+async def main(n_groups, n_requests, concurrency):
+    snap = DataSnapshot(make_db(n_groups))
+    gids = list(snap.groups)
+    t0 = time.perf_counter()
+    cache = get_detail_cache(snap)
+    for gid in gids:
+        cache.get(gid)
+    print(f"{n_groups} groups validated + serialized on first read in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    data_service.snapshot = snap
+
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, prefix in (("per-request validation", "/old"), ("pre-serialized bytes", "/new")):
+            await run(client, prefix, gids, 200, concurrency)  # warmup
+            p50, p99, rps = await run(client, prefix, gids, n_requests, concurrency)
+            print(f"{label:<24} | p50 {p50 * 1000:7.3f} ms | p99 {p99 * 1000:7.3f} ms | {rps:8.0f} req/s")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    n_groups, n_requests, concurrency = (args + [1000, 5000, 16][len(args):])[:3]
+    asyncio.run(main(n_groups, n_requests, concurrency))
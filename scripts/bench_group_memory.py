@@ -0,0 +1,116 @@
+"""
+Memori in-memory per representasi group (dilaporkan per 100k group):
+
+- full dict      : group utuh sebagai nested dict (mode eager)
+- summary dict   : ringkasan dict (header, koordinat, neighbors)
+- column store   : GroupColumns (array NumPy + intern table + neighbor CSR)
+
+Angka di atas hanya membandingkan representasi. Mode --process mengukur
+RSS proses server utuh (import app, load DB, semua warmer) per storage mode,
+masing-masing di subprocess baru.
+
+Usage (dari root repo):
+    python -m scripts.bench_group_memory [100000]
+    python -m scripts.bench_group_memory --process [100000]
+"""
+import gc
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from app.services.columns import GroupColumns
+from app.services.db_store import summarize_group
+from scripts.synthetic_db import make_groups
+
+
+def _retained(build, lines):
+    gc.collect()
+    tracemalloc.start()
+    obj = build(lines)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current
+
+
+def _full(lines):
+    return {g["id"]: g for g in map(json.loads, lines)}
+
+
+def _summary(lines):
+    return {g["id"]: summarize_group(g) for g in map(json.loads, lines)}
+
+
+def _columns(lines):
+    return GroupColumns.from_groups(map(json.loads, lines))
+
+
+def _proc_mb(key):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(key):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _child():
+    # Hanya efek samping import: modul service mendaftarkan semua warmer ke data_service
+    importlib.import_module("app.main")
+    from app.services.data_service import data_service
+
+    data_service.warm(data_service.snapshot)
+    gc.collect()
+    print(json.dumps({"rss": _proc_mb("VmRSS"), "peak": _proc_mb("VmHWM"), "groups": len(data_service.snapshot.groups)}))
+
+
+def _process(n):
+    from app.services.db_store import write_db_files
+    from scripts.synthetic_db import make_db
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_path, jsonl_path = os.path.join(tmpdir, "db.json"), os.path.join(tmpdir, "db.jsonl")
+        write_db_files(make_db(n), json_path, jsonl_path)
+        missing = os.path.join(tmpdir, "missing")
+        modes = (
+            ("empty DB", missing, missing, "eager"),
+            ("eager json", json_path, missing, "eager"),
+            ("eager jsonl", missing, jsonl_path, "eager"),
+            ("lazy jsonl", missing, jsonl_path, "lazy"),
+        )
+        for label, db_path, db_jsonl_path, storage in modes:
+            env = {
+                **os.environ,
+                "MOCK_DB_PATH": db_path,
+                "MOCK_DB_JSONL_PATH": db_jsonl_path,
+                "MOCK_DB_STORAGE": storage,
+                "MOCK_DB_WATCH_INTERVAL": "0",
+            }
+            out = subprocess.run(
+                [sys.executable, "-m", "scripts.bench_group_memory", "--child"],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{label:<12} | RSS {r['rss']:7.0f} MB | peak {r['peak']:7.0f} MB | {r['groups']} groups")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        _child()
+        sys.exit()
+    if sys.argv[1:2] == ["--process"]:
+        _process(int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
+        sys.exit()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    lines = [json.dumps(g) for g in make_groups(n).values()]
+    gc.collect()
+    scale = 100000 / n
+    for label, build in (("full dict", _full), ("summary dict", _summary), ("column store", _columns)):
+        used = _retained(build, lines)
+        print(f"{label:<13} | {used / 1e6 * scale:9.1f} MB per 100k groups | {used / n:8.0f} B/group")
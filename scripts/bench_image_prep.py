@@ -0,0 +1,79 @@
+"""
+Preprocessing gambar stage AI: cara lama (decode + resize + encode ulang
+per group di thread worker) vs image_prep (sekali per gambar unik di
+process pool, lalu bytes dari cache).
+
+Usage (dari root repo):
+    python -m scripts.bench_image_prep [n_groups] [n_images]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from scripts.image_prep import ImagePrepCache
+
+LEGACY_WORKERS = 4
+
+
+def make_images(root, n, size=(3000, 2000)):
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(n):
+        base = np.linspace(0, 255, size[0], dtype=np.float32)[None, :, None]
+        noise = rng.normal(0, 20, (size[1], size[0], 3)).astype(np.float32)
+        pixels = np.clip(base + noise + i * 10, 0, 255).astype(np.uint8)
+        path = os.path.join(root, f"home_{i}.jpg")
+        Image.fromarray(pixels).save(path, quality=90)
+        paths.append(path)
+    return paths
+
+
+def legacy_optimize(path, max_size=800, quality=85):
+    """optimize_image_memory sebelum image_prep."""
+    with Image.open(path) as img:
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=quality, optimize=True)
+        return buffer.getvalue()
+
+
+def main(n_groups, n_images):
+    with tempfile.TemporaryDirectory() as root:
+        paths = make_images(root, n_images)
+        assigned = [paths[g % len(paths)] for g in range(n_groups)]
+        print(f"{n_groups} groups, {n_images} distinct 3000x2000 JPEGs")
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=LEGACY_WORKERS) as executor:
+            legacy = list(executor.map(legacy_optimize, assigned))
+        print(f"  legacy   per-group resize ({LEGACY_WORKERS} threads): {time.perf_counter() - t0:7.2f} s")
+
+        for label, disk in (("cold", None), ("disk", os.path.join(root, "prep"))):
+            cache = ImagePrepCache(disk_dir=disk or "")
+            t0 = time.perf_counter()
+            cache.warm(assigned)
+            warm = time.perf_counter() - t0
+            prepared = [cache.get(p) for p in assigned]
+            total = time.perf_counter() - t0
+            print(f"  image_prep {label:<5} warm {warm:6.2f} s, all groups {total:6.2f} s  ({cache.summary()})")
+            assert all(prepared)
+        # Run berikutnya dengan cache disk: tanpa decode sama sekali
+        cache = ImagePrepCache(disk_dir=os.path.join(root, "prep"))
+        t0 = time.perf_counter()
+        cache.warm(assigned)
+        [cache.get(p) for p in assigned]
+        print(f"  image_prep rerun (disk cache): {time.perf_counter() - t0:7.2f} s  ({cache.summary()})")
+        print(f"  bytes/image legacy {np.mean([len(b) for b in legacy]):,.0f}, image_prep {np.mean([len(b) for b in prepared]):,.0f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 200, args[1] if len(args) > 1 else 8)
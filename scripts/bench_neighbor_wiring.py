@@ -0,0 +1,93 @@
+"""
+Wiring neighbor seeder (neighbor_wiring.py): waktu stage per mode vs jumlah
+group. Dua bentuk data: "dense" (9 village, bucket besar) dan "sparse"
+(~3 group per village, 50 per city) yang sering jatuh ke fallback
+same-city / semua group. "legacy" = loop list lama (kuadratik), hanya
+dijalankan sampai LEGACY_MAX group.
+
+Usage (dari root repo):
+    python -m scripts.bench_neighbor_wiring [n_groups ...]
+"""
+import random
+import sys
+import time
+
+from scripts.neighbor_wiring import TARGET_NEIGHBORS, wire_neighbors
+from scripts.synthetic_db import make_group
+
+LEGACY_MAX = 10000
+
+
+def make_groups(n, shape, seed=0):
+    rng = random.Random(seed)
+    groups = {}
+    for i in range(n):
+        g = make_group(i, rng)
+        if shape == "sparse":
+            g["header"]["location_city"] = f"Kota {i // 50}"
+            g["header"]["location_village"] = f"Desa {i // 3}"
+        groups[g["id"]] = g
+    return groups
+
+
+def legacy_wire(groups, k=TARGET_NEIGHBORS, rng=random):
+    """Wiring sebelum index/set sampling (list comprehension per group)."""
+    gids = list(groups.keys())
+    city_map, village_map = {}, {}
+    for gid, data in groups.items():
+        city, village = data["header"]["location_city"], data["header"]["location_village"]
+        city_map.setdefault(city, []).append(gid)
+        village_map.setdefault((city, village), []).append(gid)
+    for gid in gids:
+        my_city, my_village = groups[gid]["header"]["location_city"], groups[gid]["header"]["location_village"]
+        same_village = [x for x in village_map.get((my_city, my_village), []) if x != gid]
+        if len(same_village) >= k:
+            neighbors = rng.sample(same_village, k=k)
+        else:
+            neighbors = same_village.copy()
+            same_city = [x for x in city_map.get(my_city, []) if x != gid and x not in neighbors]
+            need = 3 - len(neighbors)
+            if same_city and need > 0:
+                neighbors += rng.sample(same_city, k=min(need, len(same_city)))
+            need = k - len(neighbors)
+            if need > 0:
+                others = [x for x in gids if x != gid and x not in neighbors]
+                if others:
+                    neighbors += rng.sample(others, k=min(need, len(others)))
+        entries = []
+        for nid in neighbors:
+            other = groups[nid]
+            dist = rng.randint(20, 500)
+            if other["type"] == "toxic":
+                rel = "Risk Contagion"
+            elif other["header"]["location_city"] == my_city:
+                rel = "Same Village" if other["header"]["location_village"] == my_village else "Same City"
+            else:
+                rel = "Shared Agent"
+            if dist < 100 and rel != "Risk Contagion":
+                rel = "Geo-Cluster"
+            entries.append({"id": nid, "name": other["header"]["name"], "risk": other["type"], "distance": f"{dist}m", "relation": rel})
+        groups[gid]["overview"]["neighbors"] = entries
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main(sizes):
+    print(f"{'groups':>8} {'shape':<7} {'legacy':>10} {'bucket':>10} {'knn':>10}")
+    for n in sizes:
+        for shape in ("dense", "sparse"):
+            groups = make_groups(n, shape)
+            legacy = timed(lambda: legacy_wire(groups, rng=random.Random(1))) if n <= LEGACY_MAX else None
+            bucket = timed(lambda: wire_neighbors(groups, mode="bucket", rng=random.Random(1)))
+            assert all(len(g["overview"]["neighbors"]) == TARGET_NEIGHBORS for g in groups.values())
+            knn = timed(lambda: wire_neighbors(groups, mode="knn"))
+            legacy_col = f"{legacy * 1000:>7.0f} ms" if legacy is not None else f"{'-':>10}"
+            print(f"{n:>8} {shape:<7} {legacy_col} {bucket * 1000:>7.0f} ms {knn * 1000:>7.0f} ms")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,17 @@
+"""
+Konversi mock_db.json lama ke format JSON-lines (streaming loader backend).
+
+Usage (dari root repo):
+    python -m scripts.convert_db_jsonl [data/mock_db.json] [data/mock_db.jsonl]
+"""
+import os
+import sys
+
+from app.services.db_store import read_db, write_db_jsonl
+
+if __name__ == "__main__":
+    src = sys.argv[1] if len(sys.argv) > 1 else "data/mock_db.json"
+    dst = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(src)[0] + ".jsonl"
+    db = read_db(src)
+    write_db_jsonl(db, dst)
+    print(f"✅ {len(db.get('groups', {}))} groups: {src} -> {dst}")
@@ -0,0 +1,104 @@
+"""
+Model Gemini palsu untuk uji stage AI seeder tanpa Vertex AI: latency acak
+dan kuota request/token per jendela waktu yang dijawab dengan error 429
+("Resource exhausted"), seperti API sungguhan.
+
+Antarmuka sama dengan GenerativeModel: generate_content (sync) dan
+generate_content_async; response punya atribut .text (JSON sesuai prompt).
+
+Usage (dari root repo):
+    AI_FAKE_MODEL=1 python -m scripts.intelligent_seeder
+"""
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+
+from scripts.ai_pipeline import estimate_tokens
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+class FakeGenerativeModel:
+    def __init__(
+        self,
+        rpm: float = 60,
+        tpm: float = 0,
+        latency=(0.5, 1.5),
+        throttle_latency: float = 0.05,
+        window: float = 60.0,
+        seed: int = 0,
+    ):
+        # rpm/tpm berlaku per `window` detik (window kecil = simulasi dipercepat)
+        self.rpm = rpm
+        self.tpm = tpm
+        self.latency = latency
+        self.throttle_latency = throttle_latency
+        self.window = window
+        self.calls = 0
+        self.throttled = 0
+        self._rng = random.Random(seed)
+        self._log = deque()  # (waktu, token) request yang diterima
+        self._used_tokens = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, inputs, generation_config=None) -> FakeResponse:
+        delay, text = self._admit(inputs)
+        time.sleep(delay)
+        if text is None:
+            raise QuotaExceeded("429 Resource exhausted. Please try again later.")
+        return FakeResponse(text)
+
+    async def generate_content_async(self, inputs, generation_config=None) -> FakeResponse:
+        delay, text = self._admit(inputs)
+        await asyncio.sleep(delay)
+        if text is None:
+            raise QuotaExceeded("429 Resource exhausted. Please try again later.")
+        return FakeResponse(text)
+
+    def _admit(self, inputs):
+        """(delay, response text); text None = request ditolak kuota."""
+        tokens = estimate_tokens(inputs, output_tokens=0)
+        now = time.monotonic()
+        with self._lock:
+            self.calls += 1
+            while self._log and now - self._log[0][0] >= self.window:
+                self._used_tokens -= self._log.popleft()[1]
+            over_rpm = len(self._log) + 1 > self.rpm
+            over_tpm = self.tpm > 0 and self._used_tokens + tokens > self.tpm
+            if over_rpm or over_tpm:
+                self.throttled += 1
+                return self.throttle_latency, None
+            self._log.append((now, tokens))
+            self._used_tokens += tokens
+            delay = self._rng.uniform(*self.latency)
+        return delay, _fake_analysis(inputs)
+
+
+def _fake_analysis(inputs) -> str:
+    prompt = next((p for p in inputs if isinstance(p, str)), "")
+    # Deterministik per prompt, supaya hasil bisa dibandingkan antar run
+    h = int.from_bytes(hashlib.blake2b(prompt.encode(), digest_size=8).digest(), "big")
+    trust = 10 + h % 90
+    badge = "LOW RISK" if trust >= 80 else "MED RISK" if trust > 25 else "HIGH RISK"
+    return json.dumps(
+        {
+            "risk_badge": badge,
+            "trust_score": trust,
+            "sentiment_text": "Kelompok stabil, pembayaran relatif lancar. (Fake)",
+            "asset_condition": ("GOOD", "AVERAGE", "POOR")[h % 3],
+            "asset_tags": ["Usaha Mikro", "Bangunan Permanen"],
+            "repayment_prediction": trust,
+            "recommendation_text": "Review Detail: hasil model palsu untuk pengujian.",
+        }
+    )
@@ -0,0 +1,165 @@
+"""
+Preprocessing gambar untuk stage AI seeder: decode + resize (maks 800px) +
+encode JPEG, sekali per gambar unik, di process pool (Pillow CPU-bound).
+
+Hasil (bytes JPEG) disimpan di cache memori LRU berbatas ukuran dengan key
+(path, mtime, size, max_size, quality), dan opsional di disk (IMAGE_PREP_DIR)
+supaya run berikutnya tidak perlu decode ulang. Worker AI tinggal menempel
+bytes yang sudah jadi.
+
+Usage (dari root repo):
+    from scripts.image_prep import image_prep
+"""
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+IMAGE_PREP_MAX_SIZE = 800
+IMAGE_PREP_QUALITY = 85
+IMAGE_PREP_WORKERS = int(os.getenv("IMAGE_PREP_WORKERS", str(min(4, os.cpu_count() or 1))))
+IMAGE_PREP_CACHE_BYTES = int(os.getenv("IMAGE_PREP_CACHE_BYTES", str(256 * 1024 * 1024)))
+IMAGE_PREP_DIR = os.getenv("IMAGE_PREP_DIR", "")  # kosong = tanpa cache disk
+
+
+def preprocess_image(path: str, max_size: int = IMAGE_PREP_MAX_SIZE, quality: int = IMAGE_PREP_QUALITY) -> bytes:
+    """Downsized RGB JPEG bytes of an image (runs in worker processes)."""
+    with Image.open(path) as img:
+        # JPEG: decode langsung di skala 1/2..1/8 (draft, tetap >= max_size) sebelum resize LANCZOS
+        img.draft("RGB", (max_size, max_size))
+        # Convert to RGB if necessary
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=quality, optimize=True)
+        return buffer.getvalue()
+
+
+def _usable(path) -> bool:
+    return bool(path) and "placeholder" not in path and os.path.exists(path)
+
+
+class ImagePrepCache:
+    """Bounded in-memory LRU of preprocessed bytes, optionally mirrored on disk."""
+
+    def __init__(
+        self,
+        max_bytes: int = IMAGE_PREP_CACHE_BYTES,
+        disk_dir: str = IMAGE_PREP_DIR,
+        max_size: int = IMAGE_PREP_MAX_SIZE,
+        quality: int = IMAGE_PREP_QUALITY,
+    ):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_size = max_size
+        self.quality = quality
+        self._entries = OrderedDict()  # key -> bytes, terlama di depan
+        self._total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.rendered = 0
+
+    def key(self, path: str):
+        st = os.stat(path)
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size, self.max_size, self.quality)
+
+    def get(self, path: str):
+        """Preprocessed bytes for path, computing inline on a miss; None if unusable."""
+        if not _usable(path):
+            return None
+        key = self.key(path)
+        data = self._lookup(key)
+        if data is None:
+            data = preprocess_image(path, self.max_size, self.quality)
+            self._store(key, data)
+        return data
+
+    def warm(self, paths, workers: int = IMAGE_PREP_WORKERS) -> int:
+        """Preprocess every distinct usable path not cached yet in a process pool; returns how many."""
+        todo = {}
+        seen = set()
+        for path in paths:
+            if not _usable(path):
+                continue
+            key = self.key(path)
+            if key not in seen:
+                seen.add(key)
+                if self._lookup(key) is None:
+                    todo[key] = path
+        if not todo:
+            return 0
+        if workers <= 1 or len(todo) == 1:
+            for key, path in todo.items():
+                self._store(key, preprocess_image(path, self.max_size, self.quality))
+            return len(todo)
+        # Bukan fork: proses induk sudah punya thread + state grpc Vertex AI. Anak
+        # spawn/forkserver hanya butuh modul ini (Pillow), dan seeder baru init Vertex di process_data
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo)), mp_context=ctx) as pool:
+            keys = list(todo)
+            results = pool.map(
+                preprocess_image, [todo[k] for k in keys], [self.max_size] * len(keys), [self.quality] * len(keys)
+            )
+            for key, data in zip(keys, results):
+                self._store(key, data)
+        return len(todo)
+
+    def _lookup(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), "rb") as f:
+                    data = f.read()
+            except OSError:
+                return None
+            self.disk_hits += 1
+            self._remember(key, data)
+            return data
+        return None
+
+    def _store(self, key, data: bytes) -> None:
+        self.rendered += 1
+        self._remember(key, data)
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            final = self._disk_path(key)
+            tmp = os.path.join(self.disk_dir, f".{os.path.basename(final)}.{os.getpid()}")
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, final)
+
+    def _remember(self, key, data: bytes) -> None:
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = data
+            self._total += len(data)
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                _, old = self._entries.popitem(last=False)
+                self._total -= len(old)
+
+    def _disk_path(self, key) -> str:
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.disk_dir, f"{name}.jpg")
+
+    def summary(self) -> str:
+        return (
+            f"{self.rendered} rendered, {self.hits} memory hits, {self.disk_hits} disk hits, "
+            f"{len(self._entries)} cached / {self._total / 1024:.0f} KB"
+        )
+
+
+image_prep = ImagePrepCache()
@@ -0,0 +1,343 @@
+"""
+Wiring overview.neighbors untuk seeder (dipisah dari intelligent_seeder.py
+supaya bisa di-benchmark tanpa Vertex AI).
+
+- knn    : k tetangga terdekat sungguhan dari lat/lng group. Index grid
+           (sel persegi di proyeksi equirectangular), kandidat dari blok sel
+           sekitar, jarak haversine dihitung vektor penuh (NumPy). Blok
+           diperlebar kalau hasilnya belum terjamin (tetangga ke-k lebih jauh
+           dari jari-jari yang tercakup blok); sisa yang sangat terisolasi
+           dihitung brute force.
+- bucket : cara lama (acak dari bucket village/city), jarak sintetis.
+           Sampling per group O(k) lewat bucket index + rejection sampling
+           (tanpa menyalin list semua group per group).
+
+Relasi "Geo-Cluster" ditentukan dari jarak terukur (< GEO_CLUSTER_M meter).
+
+Reseed inkremental (changed=...): hanya group yang terdampak yang ditulis
+ulang, yaitu group yang berubah, group yang list neighbor-nya menunjuk group
+berubah/hilang, dan (knn) group yang k terdekatnya sekarang berbeda.
+
+Usage (dari root repo):
+    from scripts.neighbor_wiring import wire_neighbors
+"""
+import os
+import random
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_008.8
+TARGET_NEIGHBORS = 5
+NEIGHBOR_MODE = os.getenv("NEIGHBOR_MODE", "knn")
+GEO_CLUSTER_M = float(os.getenv("GEO_CLUSTER_M", "100"))
+# Mode bucket: isi dari city yang sama sampai total ini, sisanya acak dari semua group
+BUCKET_CITY_FILL = 3
+
+# Rata-rata isi sel (dilihat dari tiap titik) yang dituju, dalam kelipatan k
+KNN_CELL_FILL = 2
+KNN_MIN_CELL_M = 1.0
+# Ring > ini: sisa query dihitung brute force
+KNN_MAX_RING = 8
+# Batas jumlah pasangan (query, kandidat) per chunk
+KNN_PAIR_BUDGET = 4_000_000
+
+_CELL_OFFSET = 1 << 30
+# Key sort: query lokal (< 2^22, dijamin KNN_PAIR_BUDGET) | jarak dalam 0.01 mm (< 2^41)
+_DIST_BITS = 41
+_DIST_SCALE = 1e5
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    """Great-circle distance in metres (degrees in, broadcasting)."""
+    lat1, lng1, lat2, lng2 = (np.radians(a) for a in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def knn(lat, lng, k: int = TARGET_NEIGHBORS):
+    """k nearest other points per point: (indices, distances_m), both shaped (n, min(k, n - 1)).
+
+    Exact ties resolve deterministically but not by index. Longitude wrap-around (antimeridian) is ignored.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lng = np.asarray(lng, dtype=np.float64)
+    n = len(lat)
+    k = max(0, min(k, n - 1))
+    idx = np.zeros((n, k), dtype=np.int64)
+    dist = np.zeros((n, k))
+    if k == 0:
+        return idx, dist
+
+    # Proyeksi pakai cos(lintang terjauh dari ekuator): jarak planar <= jarak sebenarnya,
+    # jadi titik dalam radius r pasti ada di blok sel yang mencakup r
+    scale = np.cos(np.radians(np.abs(lat).max()))
+    x = np.radians(lng) * EARTH_RADIUS_M * scale
+    y = np.radians(lat) * EARTH_RADIUS_M
+    grid = _Grid(x, y, _cell_size(x, y, k))
+
+    todo = np.arange(n)
+    ring = 1
+    while len(todo) and ring <= KNN_MAX_RING:
+        done, best_idx, best_dist = _query_ring(grid, lat, lng, todo, ring, k)
+        idx[todo[done]] = best_idx[done]
+        dist[todo[done]] = best_dist[done]
+        todo = todo[~done]
+        ring *= 2
+    if len(todo):
+        _query_brute(lat, lng, todo, k, idx, dist)
+    return idx, dist
+
+
+class _Grid:
+    """Points bucketed by square cell, sorted by cell key (CSR-style)."""
+
+    def __init__(self, x, y, size: float):
+        self.size = size
+        self.cx = ((x - x.min()) // size).astype(np.int64)
+        self.cy = ((y - y.min()) // size).astype(np.int64)
+        self.extent = int(max(self.cx.max(), self.cy.max())) + 1
+        key = _cell_key(self.cx, self.cy)
+        self.order = np.argsort(key, kind="stable")
+        self.keys, self.start, self.count = np.unique(key[self.order], return_index=True, return_counts=True)
+
+    def lookup(self, cx, cy):
+        """(start, count) into self.order for each cell; count 0 for empty cells."""
+        key = _cell_key(cx, cy)
+        pos = np.minimum(np.searchsorted(self.keys, key), len(self.keys) - 1)
+        hit = self.keys[pos] == key
+        return np.where(hit, self.start[pos], 0), np.where(hit, self.count[pos], 0)
+
+
+def _cell_key(cx, cy):
+    return (cx + _CELL_OFFSET) * (1 << 32) + (cy + _CELL_OFFSET)
+
+
+def _cell_size(x, y, k: int) -> float:
+    n = len(x)
+    span_x, span_y = float(np.ptp(x)), float(np.ptp(y))
+    # Batas bawah 1D supaya titik yang berjajar (luas ~0) tidak jatuh ke sel super kecil
+    size = max(
+        np.sqrt(span_x * span_y * KNN_CELL_FILL * k / n),
+        max(span_x, span_y) * KNN_CELL_FILL * k / n,
+        KNN_MIN_CELL_M,
+    )
+    # Data menggerombol: perkecil sel sampai isi rata-rata (per titik) wajar
+    while size > KNN_MIN_CELL_M:
+        _, counts = np.unique(_cell_key((x // size).astype(np.int64), (y // size).astype(np.int64)), return_counts=True)
+        if (counts.astype(np.float64) ** 2).sum() / n <= 4 * KNN_CELL_FILL * k:
+            break
+        size = max(size / 2, KNN_MIN_CELL_M)
+    return size
+
+
+def _query_ring(grid, lat, lng, queries, ring, k):
+    """k-NN of queries among the (2*ring+1)^2 surrounding cells; done = result is exact."""
+    span = np.arange(-ring, ring + 1)
+    dx, dy = (a.ravel() for a in np.meshgrid(span, span, indexing="ij"))
+    q_cx, q_cy = grid.cx[queries], grid.cy[queries]
+    start, count = grid.lookup(q_cx[:, None] + dx, q_cy[:, None] + dy)
+    per_query = count.sum(axis=1)
+
+    m = len(queries)
+    best_idx = np.zeros((m, k), dtype=np.int64)
+    best_dist = np.full((m, k), np.inf)
+    found = np.zeros(m, dtype=np.int64)
+    for lo, hi in _chunks(per_query, KNN_PAIR_BUDGET):
+        c_start, c_count = start[lo:hi].ravel(), count[lo:hi].ravel()
+        total = int(c_count.sum())
+        q_local = np.repeat(np.repeat(np.arange(lo, hi), len(dx)), c_count)
+        # Posisi di grid.order: start sel + urutan dalam sel
+        before = np.cumsum(c_count) - c_count
+        pos = np.repeat(c_start - before, c_count) + np.arange(total)
+        cand = grid.order[pos]
+        q = queries[q_local]
+        d = haversine_m(lat[q], lng[q], lat[cand], lng[cand])
+        d[cand == q] = np.inf
+        _take_best(q_local - lo, cand, d, k, best_idx[lo:hi], best_dist[lo:hi], found[lo:hi])
+
+    covers_all = ring >= grid.extent
+    done = (found >= k) & ((best_dist[:, -1] <= ring * grid.size) | covers_all)
+    if covers_all:
+        done[:] = True
+    return done, best_idx, best_dist
+
+
+def _take_best(q_local, cand, d, k, out_idx, out_dist, out_found):
+    """Per query, the k smallest finite distances (q_local must be non-decreasing)."""
+    # Satu key int64 (query, jarak terkuantisasi): argsort sekali, jauh lebih cepat dari lexsort
+    d_q = np.minimum(d * _DIST_SCALE, (1 << _DIST_BITS) - 1).astype(np.int64)
+    order = np.argsort((q_local.astype(np.int64) << _DIST_BITS) | d_q, kind="stable")
+    q_sorted = q_local[order]
+    first = np.flatnonzero(np.r_[True, q_sorted[1:] != q_sorted[:-1]])
+    rank = np.arange(len(order)) - np.repeat(first, np.diff(np.r_[first, len(order)]))
+    keep = (rank < k) & np.isfinite(d[order])
+    rows, cols, picked = q_sorted[keep], rank[keep], order[keep]
+    out_idx[rows, cols] = cand[picked]
+    out_dist[rows, cols] = d[picked]
+    out_found[:] = np.bincount(rows, minlength=len(out_found))
+
+
+def _query_brute(lat, lng, queries, k, out_idx, out_dist):
+    n = len(lat)
+    step = max(1, KNN_PAIR_BUDGET // n)
+    for lo in range(0, len(queries), step):
+        q = queries[lo:lo + step]
+        d = haversine_m(lat[q, None], lng[q, None], lat[None, :], lng[None, :])
+        d[np.arange(len(q)), q] = np.inf
+        best = np.argsort(d, axis=1, kind="stable")[:, :k]
+        out_idx[q] = best
+        out_dist[q] = np.take_along_axis(d, best, axis=1)
+
+
+def _chunks(weights, budget):
+    """Consecutive [lo, hi) ranges whose summed weight stays within budget (at least one item each)."""
+    bounds = [0]
+    acc = 0
+    for i, w in enumerate(weights.tolist()):
+        if acc and acc + w > budget:
+            bounds.append(i)
+            acc = 0
+        acc += w
+    bounds.append(len(weights))
+    return zip(bounds[:-1], bounds[1:])
+
+
+def relation_label(me: tuple, other: tuple, dist_m: float) -> str:
+    """Relation priority: Risk Contagion, Geo-Cluster (measured), Same Village, Same City, Shared Agent.
+
+    me/other are (city, village, name, type) profiles from _profiles().
+    """
+    if other[3] == "toxic":
+        return "Risk Contagion"
+    if dist_m < GEO_CLUSTER_M:
+        return "Geo-Cluster"
+    if other[0] == me[0]:
+        return "Same Village" if other[1] == me[1] else "Same City"
+    return "Shared Agent"
+
+
+def wire_neighbors(
+    groups: dict, k: int = TARGET_NEIGHBORS, mode: str = NEIGHBOR_MODE, rng=random, changed=None
+) -> int:
+    """Fill overview.neighbors in place; returns how many groups were (re)wired.
+
+    changed: ids rebuilt since the previous wiring (None = wire every group).
+    """
+    gids = list(groups)
+    targets = range(len(gids)) if changed is None else _stale(groups, gids, changed)
+    if mode == "bucket":
+        picked, dists = _pick_buckets(groups, gids, k, rng, targets)
+    elif mode == "knn":
+        # KNN semua titik tetap dihitung (murah), supaya group yang kedatangan tetangga baru ikut terdeteksi
+        lat = np.array([float(groups[g]["lat"]) for g in gids])
+        lng = np.array([float(groups[g]["lng"]) for g in gids])
+        idx, dist = knn(lat, lng, k)
+        picked, dists = idx.tolist(), dist.tolist()
+        if changed is not None:
+            moved = {i for i, gid in enumerate(gids) if _neighbor_ids(groups[gid]) != [gids[j] for j in picked[i]]}
+            targets = sorted(set(targets) | moved)
+        picked, dists = [picked[i] for i in targets], [dists[i] for i in targets]
+    else:
+        raise ValueError(f"Unknown NEIGHBOR_MODE: {mode}")
+
+    profiles = _profiles(groups, gids)
+    for i, nbrs, nbr_dists in zip(targets, picked, dists):
+        me = profiles[i]
+        groups[gids[i]]["overview"]["neighbors"] = [
+            {
+                "id": gids[j],
+                "name": profiles[j][2],
+                "risk": profiles[j][3],
+                "distance": f"{int(round(d))}m",
+                "relation": relation_label(me, profiles[j], d),
+            }
+            for j, d in zip(nbrs, nbr_dists)
+        ]
+    return len(targets)
+
+
+def _neighbor_ids(group: dict) -> list:
+    return [nb.get("id") for nb in group.get("overview", {}).get("neighbors") or []]
+
+
+def _stale(groups: dict, gids: list, changed) -> list:
+    """Indices of changed groups and of groups whose neighbor list points at a changed or removed group."""
+    changed = set(changed)
+    stale = []
+    for i, gid in enumerate(gids):
+        ids = _neighbor_ids(groups[gid])
+        if gid in changed or not ids or any(nid in changed or nid not in groups for nid in ids):
+            stale.append(i)
+    return stale
+
+
+def _profiles(groups: dict, gids: list) -> list:
+    profiles = []
+    for gid in gids:
+        g = groups[gid]
+        header = g.get("header", {})
+        profiles.append((header.get("location_city"), header.get("location_village"), header.get("name"), g.get("type")))
+    return profiles
+
+
+def _pick_buckets(groups: dict, gids: list, k: int, rng, targets):
+    """Neighbor indices for each target index from city/village buckets, plus synthetic distances."""
+    # Bucket berisi index (bukan id) supaya sampling tidak perlu menyalin list per group
+    n = len(gids)
+    city_map = {}
+    village_map = {}
+    keys = []
+    for i, gid in enumerate(gids):
+        header = groups[gid].get("header", {})
+        city = header.get("location_city")
+        key = (city, header.get("location_village"))
+        keys.append(key)
+        city_map.setdefault(city, []).append(i)
+        village_map.setdefault(key, []).append(i)
+    everyone = range(n)
+    draw = rng.random
+
+    picked_all, dists_all = [], []
+    for i in targets:
+        village = village_map[keys[i]]
+
+        # 1) Prefer neighbors from same city and same village (city must match)
+        if len(village) - 1 >= k:
+            picked = _sample_excluding(rng, village, {i}, len(village) - 1, k)
+        else:
+            picked = [x for x in village if x != i]
+            # 2) Same city (other villages) sampai BUCKET_CITY_FILL; semua anggota village sudah terpilih
+            city_pool = city_map[keys[i][0]]
+            picked += _sample_excluding(
+                rng, city_pool, set(village), len(city_pool) - len(village), BUCKET_CITY_FILL - len(picked)
+            )
+            # 3) If still need, fill with other groups from other cities
+            taken = set(picked)
+            taken.add(i)
+            picked += _sample_excluding(rng, everyone, taken, n - len(taken), k - len(picked))
+
+        picked_all.append(picked)
+        # Jarak sintetis (mode lama); Geo-Cluster tetap dari jarak ini
+        dists_all.append([20 + int(draw() * 481) for _ in picked])
+    return picked_all, dists_all
+
+
+def _sample_excluding(rng, pool, exclude: set, available: int, need: int) -> list:
+    """need distinct items of pool not in exclude (available = how many such items exist)."""
+    if need <= 0 or available <= 0:
+        return []
+    if available <= 2 * need:
+        # Hampir semua kandidat terpakai: filter eksplisit (pool kecil di kasus ini)
+        candidates = [x for x in pool if x not in exclude]
+        return rng.sample(candidates, k=min(need, len(candidates)))
+    # Rejection sampling: paling sedikit separuh tarikan diterima
+    picked = []
+    seen = set(exclude)
+    size = len(pool)
+    draw = rng.random
+    while len(picked) < need:
+        x = pool[int(draw() * size)]
+        if x not in seen:
+            seen.add(x)
+            picked.append(x)
+    return picked
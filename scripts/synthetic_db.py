@@ -0,0 +1,100 @@
+"""
+Synthetic group generator untuk benchmark (bentuk sama dengan output seeder).
+
+Usage (dari root repo):
+    from scripts.synthetic_db import make_groups
+"""
+import random
+
+CITIES = ["Jakarta Pusat", "Jakarta Utara", "Jakarta Selatan", "Jakarta Timur", "Jakarta Barat"]
+VILLAGES = [
+    "Desa Maju Jaya", "Desa Sejahtera", "Desa Makmur", "Desa Sentosa", "Desa Barokah",
+    "Desa Sinar Harapan", "Desa Cahaya Baru", "Desa Mandiri", "Desa Bersama",
+]
+RELATIONS = ["Same Village", "Same City", "Geo-Cluster", "Shared Agent", "Risk Contagion"]
+
+
+def _risk(trust_score):
+    if trust_score >= 80:
+        return "healthy", "HEALTHY RISK"
+    if trust_score > 25:
+        return "medium", "MEDIUM RISK"
+    return "toxic", "TOXIC RISK"
+
+
+def make_group(index, rng):
+    gid = f"G{str(index + 1).zfill(3)}"
+    trust_score = rng.randint(5, 99)
+    node_type, badge = _risk(trust_score)
+    return {
+        "id": gid,
+        "type": node_type,
+        "size": rng.randint(18, 50),
+        "x": rng.randint(0, 1000),
+        "y": rng.randint(0, 1000),
+        "lat": -6.59 + (rng.random() - 0.5) * 0.5,
+        "lng": 106.8 + (rng.random() - 0.5) * 0.5,
+        "header": {
+            "name": f"KELOMPOK SINTETIS {index + 1}",
+            "location_city": rng.choice(CITIES),
+            "location_village": rng.choice(VILLAGES),
+            "member_count": 15,
+            "risk_badge": badge,
+            "trust_score": trust_score,
+            "loan_eligibility": "Eligible" if trust_score > 70 else "Review",
+            "total_loan_amount": rng.randint(1_000_000, 90_000_000),
+            "visual_priority": "MEDIUM",
+        },
+        "overview": {
+            "primary_driver": {"text": "Synthetic", "payment_score": trust_score, "social_score": trust_score},
+            "metrics": {"cycle": rng.randint(1, 10), "repayment_rate": trust_score, "avg_delay": "H+0"},
+            "neighbors": [],
+        },
+        "trends": {
+            "repayment_history": [{"month": m, "rate": trust_score} for m in ["Jan", "Feb", "Mar", "Apr", "Mei", "Jun"]],
+            "asset_growth": [{"month": m, "value": trust_score} for m in ["Jan", "Feb", "Mar", "Apr", "Mei", "Jun"]],
+            "stats": {"streak": 1, "last_default": "Never", "trend_val": 2.5, "trend_dir": "up", "avg_rate": 98.0, "best_rate": 100.0},
+            "seasonality_heatmap": [1, 1, 1, 2, 2, 3, 1, 1, 1, 1, 1, 1],
+        },
+        "insights": {
+            "social_graph": {"risk_members": []},
+            "cv": {"home": {"condition": "AVERAGE", "img_url": "placeholder_home.jpg"}, "biz": {"type": "Warung", "img_url": "placeholder_bisnis.jpg"}},
+            "prediction": {"default_risk_prob": 100 - trust_score, "horizon_days": 30, "what_if": {}},
+            "recommendation_text": "Synthetic",
+        },
+        "decision": {"last_audit": "Agent Budi", "is_locked": node_type == "toxic", "audit_date": "2025-01-01"},
+    }
+
+
+def make_groups(n, neighbors=5, seed=0):
+    """Return {gid: group} with `neighbors` random neighbor links per group."""
+    rng = random.Random(seed)
+    groups = {}
+    for i in range(n):
+        g = make_group(i, rng)
+        groups[g["id"]] = g
+    gids = list(groups)
+    for gid, g in groups.items():
+        for _ in range(min(neighbors, n - 1)):
+            nid = gids[rng.randrange(n)]
+            if nid == gid:
+                continue
+            n_data = groups[nid]
+            g["overview"]["neighbors"].append(
+                {
+                    "id": nid,
+                    "name": n_data["header"]["name"],
+                    "risk": n_data["type"],
+                    "distance": f"{rng.randint(20, 500)}m",
+                    "relation": rng.choice(RELATIONS),
+                }
+            )
+    return groups
+
+
+def make_db(n, neighbors=5, seed=0):
+    return {
+        "meta": {"version": "synthetic", "generated_at": "synthetic"},
+        "global_state": {"wallet_balance": 1000000000, "spending_history": [100, 200, 300]},
+        "groups": make_groups(n, neighbors=neighbors, seed=seed),
+    }
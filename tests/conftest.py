@@ -0,0 +1,21 @@
+import pytest
+
+from app.services.data_service import DataSnapshot, data_service
+
+
+@pytest.fixture
+def install_db(monkeypatch):
+    """Swap `db` in as the live snapshot (warmed like a reload); restored after the test."""
+    monkeypatch.setattr(data_service, "snapshot", data_service.snapshot)
+
+    def install(db):
+        snap = DataSnapshot(db)
+        snap.previous = data_service.snapshot
+        try:
+            data_service.warm(snap)
+        finally:
+            snap.previous = None
+        data_service.snapshot = snap
+        return snap
+
+    return install
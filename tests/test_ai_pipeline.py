@@ -0,0 +1,49 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+from scripts.ai_pipeline import AIPipeline, RateLimiter
+
+
+async def double(x):
+    return x * 2
+
+
+async def prepare(payload):
+    return payload, 10
+
+
+@pytest.mark.parametrize("rpm, tpm", [(0, 1000), (-5, 1000), (60, -1)])
+def test_rejects_invalid_rates(rpm, tpm):
+    with pytest.raises(ValueError):
+        RateLimiter(rpm, tpm)
+    with pytest.raises(ValueError):
+        AIPipeline(double, prepare, rpm=rpm, tpm=tpm)
+
+
+def test_zero_rpm_env_fails_at_import():
+    env = {**os.environ, "AI_RPM": "0"}
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run(
+        [sys.executable, "-c", "import scripts.ai_pipeline"], cwd=root, env=env, capture_output=True, text=True
+    )
+    assert out.returncode != 0
+    assert "AI_RPM must be > 0" in out.stderr
+
+
+def test_on_result_error_does_not_stop_run():
+    seen = []
+
+    def on_result(key, result):
+        if key == 3:
+            raise OSError("disk full")
+        seen.append(key)
+
+    pipeline = AIPipeline(double, prepare, rpm=6000, tpm=0)
+    results = asyncio.run(pipeline.run([(i, i) for i in range(10)], on_result=on_result))
+    assert results == {i: i * 2 for i in range(10)}
+    assert sorted(seen) == [i for i in range(10) if i != 3]
+    assert pipeline.stats["callback_errors"] == 1
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from app.services.communities import (
+    DEFAULT_RELATION_WEIGHT,
+    _relabel,
+    connected_components,
+    get_communities,
+    label_propagation,
+)
+from app.services.data_service import DataSnapshot
+from app.services.graph_service import get_topology
+from scripts.synthetic_db import make_groups
+
+# Dua clique K4 (0-3, 4-7) relasi rapat, disambung satu relasi lemah 3-4; plus 8-9 dan 10 terisolasi
+CLIQUES = [(a, b) for block in (range(0, 4), range(4, 8)) for a in block for b in block if a < b]
+EDGES = CLIQUES + [(8, 9)]
+BRIDGE = (3, 4)
+N = 11
+
+
+def adjacency():
+    edges = EDGES + [BRIDGE]
+    weights = [1.0] * len(EDGES) + [DEFAULT_RELATION_WEIGHT]
+    src = np.array([a for a, b in edges] + [b for a, b in edges])
+    dst = np.array([b for a, b in edges] + [a for a, b in edges])
+    order = np.argsort(src, kind="stable")
+    return src[order], dst[order], np.array(weights * 2)[order]
+
+
+def test_connected_components():
+    src, dst = np.array([a for a, _ in EDGES + [BRIDGE]]), np.array([b for _, b in EDGES + [BRIDGE]])
+    roots = connected_components(N, src, dst)
+    assert roots.tolist() == [0] * 8 + [8, 8, 10]
+    assert _relabel(roots).tolist() == [0] * 8 + [1, 1, 2]
+
+
+def test_label_propagation_splits_cliques():
+    slot_row, slot_nbr, slot_weight = adjacency()
+    labels, rounds = label_propagation(N, slot_row, slot_nbr, slot_weight)
+    assert rounds >= 1
+    assert len(set(labels[0:4].tolist())) == 1
+    assert len(set(labels[4:8].tolist())) == 1
+    assert labels[0] != labels[4]
+    assert labels[8] == labels[9]
+    assert labels[10] == 10  # tanpa tetangga: label sendiri
+
+
+@pytest.mark.parametrize("k", [4, 5, 8])
+def test_label_propagation_converges_on_two_cliques(k):
+    # Tanpa cek "masih ada yang ingin ganti": ronde yang kebetulan tidak mengundi node itu
+    # dianggap konvergen dan satu node tertinggal dengan label sendiri
+    edges = [(a, b) for block in (range(0, k), range(k, 2 * k)) for a in block for b in block if a < b]
+    edges.append((k - 1, k))
+    src = np.array([a for a, b in edges] + [b for a, b in edges])
+    dst = np.array([b for a, b in edges] + [a for a, b in edges])
+    order = np.argsort(src, kind="stable")
+    labels, _ = label_propagation(2 * k, src[order], dst[order], np.ones(len(src)))
+    assert labels.tolist() == [0] * k + [k] * k
+
+
+def test_communities_on_snapshot():
+    groups = make_groups(N, neighbors=0)
+    ids = list(groups)
+    for (a, b), relation in [(e, "Same Village") for e in EDGES] + [(BRIDGE, "Risk Contagion")]:
+        groups[ids[a]]["overview"]["neighbors"].append({"id": ids[b], "relation": relation})
+    snap = DataSnapshot({"groups": groups})
+
+    comm = get_communities(snap)
+    assert comm.component.tolist() == [0] * 8 + [1, 1, 2]
+    assert comm.community_count == 4
+    assert not comm.community.flags.writeable
+    # Label hanya di objek Communities, column store tidak disentuh
+    assert not hasattr(snap.columns, "community_id")
+
+    attrs = [n["attributes"] for n in get_topology(snap).nodes]
+    assert [a["community"] for a in attrs] == comm.community.tolist()
+    assert [a["component"] for a in attrs] == comm.component.tolist()
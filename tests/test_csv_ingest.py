@@ -0,0 +1,67 @@
+import csv
+
+import pytest
+
+from scripts import bench_csv_ingest as bench
+from scripts.csv_ingest import ingest
+
+
+def write_csv(path, header, rows, delimiter=","):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter=delimiter)
+        w.writerow(header)
+        w.writerows(rows)
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    """Dua group x 3 customer: purpose seri, dpd/amount kotor, loan tanpa task, delimiter ';'."""
+    write_csv(
+        tmp_path / "customers.csv",
+        ["customer_number", "purpose"],
+        [["C1", "Warung"], ["C2", "Jahit"], ["C3", "Bengkel"], ["C4", "Ternak"], ["C5", "Ternak"], ["C6", "Kue"]],
+    )
+    write_csv(tmp_path / "tasks.csv", ["task_id", "latitude", "longitude"], [["T1", "-6.2", "106.8"], ["T2", "-6.3", "106.9"]])
+    write_csv(tmp_path / "task_participants.csv", ["participant_id", "task_id"], [["L2", "T1"], ["L5", "T2"], ["L6", "T9"]])
+    write_csv(
+        tmp_path / "loan_snapshots.csv",
+        ["customer_number", "loan_id", "dpd", "outstanding_amount"],
+        [
+            ["C1", "L1", "3.7", "1000"],
+            ["C2", "L2", "abc", "2500.5"],
+            [" C1 ", "L3", "10", "x"],
+            ["C4", "L6", "0", "700"],
+            ["C5", "L5", "40", "300"],
+            ["C9", "L9", "99", "99"],
+        ],
+        delimiter=";",
+    )
+    return str(tmp_path)
+
+
+def test_matches_legacy_loop(raw_dir, monkeypatch):
+    monkeypatch.setattr(bench, "GROUP_SIZE", 3)
+    assert [tuple(s)[:5] for s in ingest(raw_dir, 3, 100)] == bench.legacy_summaries(raw_dir)
+
+
+def test_matches_legacy_loop_random(tmp_path):
+    bench.make_csvs(str(tmp_path), 5000, seed=3)
+    expected = bench.legacy_summaries(str(tmp_path))
+    assert [tuple(s)[:5] for s in ingest(str(tmp_path), bench.GROUP_SIZE, bench.MAX_NODES)] == expected
+
+
+def test_summaries(raw_dir):
+    first, second = ingest(raw_dir, 3, 100)
+    assert first.batch_ids == ["C1", "C2", "C3"]
+    assert first.avg_dpd == (3 + 10) / 3
+    assert first.total_loan == 3500.5
+    assert first.location == (-6.2, 106.8)
+    assert second.avg_dpd == 40 / 3
+    assert second.location == (-6.3, 106.9)
+
+
+def test_common_business_tie_is_alphabetical(raw_dir):
+    # Warung/Jahit/Bengkel masing-masing satu: seri diputus urutan abjad, bukan urutan set()
+    first, second = ingest(raw_dir, 3, 100)
+    assert first.common_biz == "Bengkel"
+    assert second.common_biz == "Ternak"
@@ -0,0 +1,69 @@
+import base64
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from scripts.synthetic_db import make_db
+
+client = TestClient(app)
+
+
+def walk(params, limit):
+    """Every page of /graph for `params`; returns (node keys, edge keys) in page order."""
+    nodes, edges, cursor = [], [], None
+    while True:
+        page = client.get("/api/v1/graph", params={**params, "limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert page.status_code == 200
+        body = page.json()
+        nodes += [n["key"] for n in body["nodes"]]
+        edges += [e["key"] for e in body["edges"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return nodes, edges, body["total_nodes"]
+
+
+def cursor_at(cursor, offset):
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    return base64.urlsafe_b64encode(f"{raw.split(':')[0]}:{offset}".encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("params", [{}, {"risk": "toxic"}, {"min_trust": 30, "max_trust": 80}])
+def test_pages_cover_every_row_once(install_db, params):
+    install_db(make_db(250))
+    full = client.get("/api/v1/graph", params=params).json()
+
+    nodes, edges, total = walk(params, limit=37)
+
+    assert total == len(full["nodes"])
+    assert sorted(nodes) == sorted(n["key"] for n in full["nodes"])
+    assert len(nodes) == len(set(nodes))
+    assert sorted(edges) == sorted(e["key"] for e in full["edges"])
+    assert len(edges) == len(set(edges))
+
+
+def test_cursor_expires_after_reload(install_db):
+    install_db(make_db(120, seed=0))
+    cursor = client.get("/api/v1/graph", params={"limit": 50}).json()["next_cursor"]
+    assert client.get("/api/v1/graph", params={"limit": 50, "cursor": cursor}).status_code == 200
+
+    install_db(make_db(120, seed=1))
+    assert client.get("/api/v1/graph", params={"limit": 50, "cursor": cursor}).status_code == 410
+
+
+def test_cursor_offset_out_of_range(install_db):
+    install_db(make_db(120))
+    cursor = client.get("/api/v1/graph", params={"limit": 50}).json()["next_cursor"]
+
+    for offset in (-1, 121):
+        page = client.get("/api/v1/graph", params={"limit": 50, "cursor": cursor_at(cursor, offset)})
+        assert page.status_code == 400
+    assert client.get("/api/v1/graph", params={"limit": 50, "cursor": "not-a-cursor"}).status_code == 400
+
+
+@pytest.mark.parametrize("bbox", ["nan,0,1,1", "0,inf,1,1", "0,0,-inf,1", "0,0,1", "a,b,c,d"])
+def test_bbox_rejects_malformed_and_non_finite(install_db, bbox):
+    install_db(make_db(50))
+    page = client.get("/api/v1/graph", params={"bbox": bbox})
+    assert page.status_code == 422
+    assert page.json()["detail"] == "bbox must be x0,y0,x1,y1"
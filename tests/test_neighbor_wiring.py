@@ -0,0 +1,56 @@
+import copy
+
+import pytest
+
+from scripts.neighbor_wiring import wire_neighbors
+from scripts.synthetic_db import make_groups
+
+
+def neighbors(groups):
+    return {gid: g["overview"]["neighbors"] for gid, g in groups.items()}
+
+
+def moved(groups):
+    # Satu group pindah ke dekat group lain (input CSV berubah)
+    groups["G010"]["lat"], groups["G010"]["lng"] = groups["G200"]["lat"] + 1e-4, groups["G200"]["lng"]
+    return ["G010"]
+
+
+def retyped(groups):
+    groups["G010"]["type"] = "toxic" if groups["G010"]["type"] != "toxic" else "healthy"
+    return ["G010"]
+
+
+def added(groups):
+    new = copy.deepcopy(groups["G010"])
+    new["id"], new["overview"]["neighbors"] = "G999", []
+    new["lat"] += 1e-4
+    groups["G999"] = new
+    return ["G999"]
+
+
+def removed(groups):
+    del groups["G010"]
+    return []
+
+
+@pytest.mark.parametrize("change", [moved, retyped, added, removed])
+def test_incremental_rewire_matches_full(change):
+    groups = make_groups(300, neighbors=0)
+    wire_neighbors(groups, mode="knn")
+    changed = change(groups)
+
+    incremental, full = copy.deepcopy(groups), copy.deepcopy(groups)
+    rewired = wire_neighbors(incremental, mode="knn", changed=changed)
+    wire_neighbors(full, mode="knn")
+
+    assert neighbors(incremental) == neighbors(full)
+    assert 0 < rewired < len(groups) // 4
+
+
+def test_unchanged_rewires_nothing():
+    groups = make_groups(100, neighbors=0)
+    wire_neighbors(groups, mode="knn")
+    before = copy.deepcopy(neighbors(groups))
+    assert wire_neighbors(groups, mode="knn", changed=[]) == 0
+    assert neighbors(groups) == before
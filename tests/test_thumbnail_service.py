@@ -0,0 +1,42 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from app.services.thumbnail_service import render_variant
+
+
+def write_jpeg(path, size=(64, 48)):
+    buf = io.BytesIO()
+    Image.new("RGB", size, (200, 10, 10)).save(buf, format="JPEG")
+    path.write_bytes(buf.getvalue())
+    return buf.getvalue()
+
+
+def test_render_variant_writes_atomically(tmp_path):
+    src, dst = tmp_path / "src.jpg", tmp_path / "cache" / "out.webp"
+    dst.parent.mkdir()
+    write_jpeg(src)
+    size = render_variant(str(src), str(dst), 32, None, 80, "WEBP")
+    assert size == os.path.getsize(dst)
+    with Image.open(dst) as img:
+        assert img.size == (32, 24)
+    assert os.listdir(dst.parent) == ["out.webp"]
+
+
+def test_render_variant_removes_tmp_on_failure(tmp_path, monkeypatch):
+    src, dst = tmp_path / "src.jpg", tmp_path / "cache" / "out.jpg"
+    dst.parent.mkdir()
+    write_jpeg(src)
+    save = Image.Image.save
+
+    def save_then_fail(self, fp, *args, **kwargs):
+        # Disk penuh di tengah tulis: file .tmp sudah ada, lalu save gagal
+        save(self, fp, *args, **kwargs)
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(Image.Image, "save", save_then_fail)
+    with pytest.raises(OSError):
+        render_variant(str(src), str(dst), 32, 32, 80, "JPEG")
+    assert os.listdir(dst.parent) == []